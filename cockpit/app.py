@@ -1,37 +1,92 @@
-from flask import Flask, render_template, jsonify
+import os
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
 from common.config import Config
 from common.logger import setup_logger
-import threading, argparse, requests
+import argparse, asyncio, time, httpx
 
 log = setup_logger('cockpit')
-app = Flask(__name__, template_folder='templates', static_folder='static')
+app = FastAPI(title="Reflex Cockpit")
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+app.mount('/static', StaticFiles(directory=os.path.join(_HERE, 'static')), name='static')
+templates = Jinja2Templates(directory=os.path.join(_HERE, 'templates'))
 
 DATAHUB = f"http://{Config.DATAHUB_HOST}:{Config.DATAHUB_PORT}"
+# DataHub is served by uvicorn (HTTP/1.1 only), so concurrency comes from the
+# keep-alive pool rather than HTTP/2 multiplexing.
+DATAHUB_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30)
 
-def _ensure_sim_running():
+async def _ensure_sim_running(client: httpx.AsyncClient):
     try:
-        requests.post(f"{DATAHUB}/control/sim", json={'mode':'start'}, timeout=2)
+        await client.post("/control/sim", json={'mode':'start'})
     except Exception:
         pass
 
-@app.route('/')
-def home():
-    return render_template('home.html')
+@app.on_event("startup")
+async def _startup():
+    # One shared async client: keep-alive connections multiplexed on the event loop
+    app.state.client = httpx.AsyncClient(base_url=DATAHUB, timeout=2.0, limits=DATAHUB_LIMITS)
+    # kick the sim feed without holding up startup (reference kept so it isn't GC'd)
+    app.state.sim_kick = asyncio.create_task(_ensure_sim_running(app.state.client))
+
+@app.on_event("shutdown")
+async def _shutdown():
+    await app.state.client.aclose()
+
+@app.get('/')
+async def home(request: Request):
+    return templates.TemplateResponse('home.html', {'request': request})
+
+# /symbols changes rarely: serve it from memory for SYMBOLS_TTL seconds, then
+# keep serving the stale copy while a single background refresh runs.
+SYMBOLS_TTL = 5.0
+_SYMBOLS_CACHE = {'ts': 0.0, 'data': None, 'refresh': None}
+_SYMBOLS_LOCK = asyncio.Lock()
+
+async def _fetch_symbols(client: httpx.AsyncClient):
+    r = await client.get("/symbols")
+    r.raise_for_status()
+    _SYMBOLS_CACHE['data'] = r.json()
+    _SYMBOLS_CACHE['ts'] = time.monotonic()
+    return _SYMBOLS_CACHE['data']
+
+async def _revalidate_symbols(client: httpx.AsyncClient):
+    try:
+        async with _SYMBOLS_LOCK:
+            await _fetch_symbols(client)
+    except Exception as e:
+        log.warning(f"symbols refresh failed, serving stale copy: {e}")
 
-@app.route('/api/symbols')
-def api_symbols():
+@app.get('/api/symbols')
+async def api_symbols(request: Request):
+    cache = _SYMBOLS_CACHE
+    client = request.app.state.client
+    if cache['data'] is not None:
+        if time.monotonic() - cache['ts'] >= SYMBOLS_TTL:
+            task = cache['refresh']
+            if task is None or task.done():
+                cache['refresh'] = asyncio.create_task(_revalidate_symbols(client))
+        return JSONResponse(cache['data'])
     try:
-        r = requests.get(f"{DATAHUB}/symbols", timeout=2)
-        return jsonify(r.json())
+        # cold cache: concurrent misses queue on the lock and reuse the first fetch
+        async with _SYMBOLS_LOCK:
+            data = cache['data']
+            if data is None:
+                data = await _fetch_symbols(client)
+        return JSONResponse(data)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return JSONResponse({'error': str(e)}, status_code=500)
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('--port', type=int, default=Config.COCKPIT_PORT)
     args = parser.parse_args()
-    # kick the sim feed
-    threading.Thread(target=_ensure_sim_running, daemon=True).start()
-    from waitress import serve
+    import uvicorn
     log.info(f"Starting Cockpit on 127.0.0.1:{args.port}")
-    serve(app, host='127.0.0.1', port=args.port)
+    # loop/http "auto" pick uvloop + httptools when installed (uvicorn[standard]);
+    # uvloop is unavailable on Windows, where the stock asyncio loop is used.
+    uvicorn.run(app, host='127.0.0.1', port=args.port, workers=1,
+                loop='auto', http='auto', access_log=False)
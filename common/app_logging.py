@@ -6,9 +6,16 @@ import logging.handlers
 import os
 import sys
 import json
+import time
+import functools
 from datetime import datetime
 from typing import Optional, Iterable
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 __all__ = [
     "get_logger",
     "setup_logger",
@@ -24,12 +31,42 @@ _PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardi
 # Default log directory (override with REFLEX_LOG_DIR env var)
 LOG_DIR = os.getenv("REFLEX_LOG_DIR", os.path.join(_PROJECT_ROOT, "logs"))
 
+# Default JsonFormatter time format (rendered by _fast_iso_utc without strftime)
+_DEFAULT_TIMEFMT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+# Attributes every LogRecord carries; anything else on a record is an "extra"
+_STANDARD_LOGRECORD_ATTRS = frozenset(vars(logging.makeLogRecord({})).keys())
+
 # Marker attribute to prevent duplicate handlers
 _REFLEX_HANDLER_FLAG = "_reflex_handler"
+# Per-logger set of installed handler kinds (O(1) duplicate check)
+_REFLEX_KINDS_ATTR = "_reflex_kinds"
 
 
 # ---------- Utilities ----------
 
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp
+_ISO_SECOND_CACHE: tuple[int, str] = (-1, "")
+
+
+def _fast_iso_utc(ns: int) -> str:
+    """
+    Format epoch nanoseconds as _DEFAULT_TIMEFMT. The second-resolution prefix
+    is rebuilt at most once per second; the rest is integer arithmetic.
+    """
+    global _ISO_SECOND_CACHE
+    sec, rem = divmod(ns, 1_000_000_000)
+    cached_sec, prefix = _ISO_SECOND_CACHE
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ISO_SECOND_CACHE = (sec, prefix)
+    return f"{prefix}.{rem // 1000:06d}Z"
+
+
+@functools.lru_cache(maxsize=32)
 def _level_to_int(level: str | int | None, default: int = logging.INFO) -> int:
     if isinstance(level, int):
         return level
@@ -46,7 +83,7 @@ class JsonFormatter(logging.Formatter):
     Non-serializable values are converted to strings.
     """
     def __init__(self, include_time: bool = True, time_key: str = "time",
-                 timefmt: str = "%Y-%m-%dT%H:%M:%S.%fZ"):
+                 timefmt: str = _DEFAULT_TIMEFMT):
         super().__init__()
         self.include_time = include_time
         self.time_key = time_key
@@ -60,7 +97,10 @@ class JsonFormatter(logging.Formatter):
         }
 
         if self.include_time:
-            payload[self.time_key] = datetime.utcnow().strftime(self.timefmt)
+            if self.timefmt == _DEFAULT_TIMEFMT:
+                payload[self.time_key] = _fast_iso_utc(time.time_ns())
+            else:
+                payload[self.time_key] = datetime.utcnow().strftime(self.timefmt)
 
         payload.update({
             "filename": record.filename,
@@ -70,23 +110,24 @@ class JsonFormatter(logging.Formatter):
             "thread": record.thread,
         })
 
-        # Merge extra fields if any
-        standard = set(vars(logging.makeLogRecord({})).keys())
+        # Merge extra fields if any (non-serializable values fall back to str)
         for key, value in record.__dict__.items():
             if key.startswith("_"):
                 continue
-            if key in standard:
+            if key in _STANDARD_LOGRECORD_ATTRS:
                 continue
-            try:
-                json.dumps({key: value})
-                payload[key] = value
-            except TypeError:
-                payload[key] = str(value)
+            payload[key] = value
 
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
 
-        return json.dumps(payload, ensure_ascii=False)
+        if orjson is not None:
+            try:
+                return orjson.dumps(payload, default=str, option=_ORJSON_OPTS).decode()
+            except TypeError:
+                # e.g. ints wider than 64 bits; stdlib json copes with those
+                pass
+        return json.dumps(payload, ensure_ascii=False, default=str)
 
 
 def _ensure_log_dir(path: str) -> None:
@@ -96,11 +137,18 @@ def _ensure_log_dir(path: str) -> None:
         pass
 
 
+def _reflex_kinds(logger: logging.Logger) -> set[str]:
+    kinds = getattr(logger, _REFLEX_KINDS_ATTR, None)
+    if kinds is None:
+        # First touch: seed from any handlers installed before the set existed
+        kinds = {getattr(h, _REFLEX_HANDLER_FLAG) for h in logger.handlers
+                 if getattr(h, _REFLEX_HANDLER_FLAG, None) is not None}
+        setattr(logger, _REFLEX_KINDS_ATTR, kinds)
+    return kinds
+
+
 def _have_reflex_handler(logger: logging.Logger, kind: str) -> bool:
-    for h in logger.handlers:
-        if getattr(h, _REFLEX_HANDLER_FLAG, None) == kind:
-            return True
-    return False
+    return kind in _reflex_kinds(logger)
 
 
 def _install_stdout_handler(
@@ -113,6 +161,7 @@ def _install_stdout_handler(
     sh.setFormatter(formatter)
     setattr(sh, _REFLEX_HANDLER_FLAG, "stdout")
     logger.addHandler(sh)
+    _reflex_kinds(logger).add("stdout")
 
 
 def _install_rotating_file_handler(
@@ -135,6 +184,7 @@ def _install_rotating_file_handler(
     fh.setFormatter(formatter)
     setattr(fh, _REFLEX_HANDLER_FLAG, f"file:{log_file}")
     logger.addHandler(fh)
+    _reflex_kinds(logger).add(f"file:{log_file}")
 
 
 # ---------- Public API ----------
@@ -231,8 +281,6 @@ def quiet_third_party(
     Reduce verbosity from common noisy libraries.
     """
     lvl = _level_to_int(level)
+    get = logging.getLogger
     for n in names:
-        try:
-            logging.getLogger(n).setLevel(lvl)
-        except Exception:
-            pass
+        get(n).setLevel(lvl)
@@ -1,6 +1,6 @@
 # common/cache.py
 from __future__ import annotations
-import os, time, logging
+import os, time, logging, functools
 from typing import Optional
 
 try:
@@ -18,6 +18,7 @@ _LOG.setLevel(logging.INFO)
 def _env(name: str, default: Optional[str] = None) -> Optional[str]:
     return os.environ.get(name, default)
 
+@functools.lru_cache(maxsize=1)
 def _build_url() -> str:
     for key in ("CACHE_URL", "GARNET_URL", "REDIS_URL"):
         url = _env(key)
@@ -30,22 +31,67 @@ def _build_url() -> str:
     auth = f":{password}@" if password else ""
     return f"redis://{auth}{host}:{port}/{db}"
 
+@functools.lru_cache(maxsize=1)
+def _default_cache():
+    # redis.Redis is thread-safe for commands; share one client and its pool
+    return redis.Redis.from_url(_build_url(), decode_responses=True)
+
 def get_cache(**kwargs):
     if redis is None:
         raise RuntimeError("redis package not installed; pip install redis")
+    if not kwargs:
+        return _default_cache()
     url = _build_url()
     return redis.Redis.from_url(url, decode_responses=True, **kwargs)
 
-def ensure_cache_available(timeout_sec: int = 5, interval: float = 0.25) -> None:
+def ensure_cache_available(timeout_sec: int = 5, interval: float = 0.5) -> None:
+    """
+    Block until the cache answers PING. Retries back off exponentially from
+    25ms up to `interval` seconds so a quickly-recovering cache is seen early.
+    """
     client = get_cache(socket_connect_timeout=timeout_sec)
-    deadline = time.time() + timeout_sec
+    deadline = time.monotonic() + timeout_sec
+    delay = 0.025
     last_err = None
-    while time.time() < deadline:
+    while True:
         try:
             client.ping()
             _LOG.info("Cache is available")
             return
         except Exception as ex:
             last_err = ex
-            time.sleep(interval)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, interval)
+    raise RuntimeError(f"Cache not reachable: {last_err}")
+
+async def ensure_cache_available_async(timeout_sec: int = 5, interval: float = 0.5) -> None:
+    """asyncio counterpart of ensure_cache_available (uses redis.asyncio)."""
+    if redis is None:
+        raise RuntimeError("redis package not installed; pip install redis")
+    import asyncio
+    import redis.asyncio as aioredis
+    client = aioredis.Redis.from_url(_build_url(), decode_responses=True,
+                                     socket_connect_timeout=timeout_sec)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_sec
+    delay = 0.025
+    last_err = None
+    try:
+        while True:
+            try:
+                await client.ping()
+                _LOG.info("Cache is available")
+                return
+            except Exception as ex:
+                last_err = ex
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, interval)
+    finally:
+        await client.aclose()
     raise RuntimeError(f"Cache not reachable: {last_err}")
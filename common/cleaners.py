@@ -1,24 +1,52 @@
 # common/cleaners.py
 from __future__ import annotations
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 def clean_float(v, default: float | None = None) -> float | None:
+    if v is None:
+        return default
+    if type(v) is float:
+        return default if v != v else v  # NaN
+    if isinstance(v, str) and not v:
+        return default
     try:
-        if v is None:
-            return default
         fv = float(v)
-        if fv != fv:  # NaN
-            return default
-        return fv
-    except Exception:
+    except (TypeError, ValueError, OverflowError):
         return default
+    return default if fv != fv else fv
 def clean_int(v, default: int | None = None) -> int | None:
+    if v is None:
+        return default
+    if type(v) is int:
+        return v
+    if isinstance(v, str) and not v:
+        return default
     try:
-        if v is None:
-            return default
         return int(v)
-    except Exception:
+    except (TypeError, ValueError, OverflowError):
         return default
 
+def clean_float_array(values, default: float = float("nan")):
+    """
+    Vectorized clean_float: returns a float64 ndarray with None/NaN/unparseable
+    entries replaced by `default`.
+    """
+    if np is None:
+        raise RuntimeError("numpy not installed; pip install numpy")
+    try:
+        out = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        # mixed/dirty input (e.g. '' or 'n/a'): fall back to the scalar cleaner
+        out = np.fromiter((clean_float(v, float("nan")) for v in values), dtype=np.float64)
+    mask = np.isnan(out)
+    if mask.any():
+        out[mask] = default
+    return out
+
 def valid_bar(open_: float, high: float, low: float, close: float) -> bool:
     if any(x is None for x in (open_, high, low, close)):
         return False
@@ -26,3 +54,20 @@ def valid_bar(open_: float, high: float, low: float, close: float) -> bool:
     if not (low <= open_ <= high): return False
     if not (low <= close <= high): return False
     return True
+
+def valid_bars(open_, high, low, close):
+    """
+    Vectorized valid_bar over equal-length OHLC columns; returns a boolean mask.
+    NaN in any column marks the bar invalid.
+    """
+    if np is None:
+        raise RuntimeError("numpy not installed; pip install numpy")
+    o = np.asarray(open_, dtype=np.float64)
+    h = np.asarray(high, dtype=np.float64)
+    l = np.asarray(low, dtype=np.float64)
+    c = np.asarray(close, dtype=np.float64)
+    # NaN compares False, so the range checks alone reject incomplete bars
+    m = h >= l
+    m &= (o >= l) & (o <= h)
+    m &= (c >= l) & (c <= h)
+    return m
@@ -2,9 +2,18 @@
 from __future__ import annotations
 import os
 import json
-import psycopg2
+import threading
+from dataclasses import asdict
+from typing import TYPE_CHECKING
 from common.app_logging import setup_logger
-from common.config import DB_PARAMS  # <-- use DB_PARAMS, not DB_CONFIG
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    import psycopg2.pool
 
 log = setup_logger("common")
 
@@ -13,32 +22,111 @@ ROOT_DIR   = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 FLAGS_PATH = os.path.join(ROOT_DIR, "common", "lifecycle_flags.json")
 CONFIG_PATH= os.path.join(ROOT_DIR, "common", "config.json")
 
+# ── Connection pool ──────────────────────────────────────────────────────
+_PG_POOL: psycopg2.pool.ThreadedConnectionPool | None = None
+_PG_POOL_LOCK = threading.Lock()
+
+def _pg_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    """
+    Process-wide pool, created on first use so importing this module
+    never opens a DB connection.
+    """
+    global _PG_POOL
+    if _PG_POOL is None:
+        # psycopg2 is imported lazily: most importers only need the JSON loaders
+        import psycopg2.pool
+        from common.config import DB_PARAMS  # <-- use DB_PARAMS, not DB_CONFIG
+        with _PG_POOL_LOCK:
+            if _PG_POOL is None:
+                _PG_POOL = psycopg2.pool.ThreadedConnectionPool(
+                    minconn=1, maxconn=8, **asdict(DB_PARAMS)
+                )
+    return _PG_POOL
+
 # ── Metadata loaders ─────────────────────────────────────────────────────
-def load_symbols_from_db() -> list[str]:
+# Loose index scan: walks the (symbol, ts_utc) primary key one distinct symbol
+# at a time instead of reading every tick row like SELECT DISTINCT does.
+_DISTINCT_TICK_SYMBOLS_SQL = """
+WITH RECURSIVE t AS (
+    SELECT min(symbol) AS s FROM ticks
+    UNION ALL
+    SELECT (SELECT min(symbol) FROM ticks WHERE symbol > t.s)
+    FROM t WHERE t.s IS NOT NULL
+)
+SELECT s FROM t WHERE s IS NOT NULL
+"""
+
+SYMBOLS_CACHE_KEY = "reflex:symbols:ticks"
+SYMBOLS_CACHE_TTL = 60  # seconds
+
+def _symbols_cache():
+    try:
+        from common.cache import get_cache
+        return get_cache()
+    except Exception:
+        return None
+
+def load_symbols_from_db(use_cache: bool = True) -> list[str]:
     """
     Returns DISTINCT symbols from ticks table.
+    Served from the cache (SYMBOLS_CACHE_TTL) when one is reachable.
     """
-    conn = psycopg2.connect(**DB_PARAMS)
+    cache = _symbols_cache() if use_cache else None
+    if cache is not None:
+        try:
+            hit = cache.get(SYMBOLS_CACHE_KEY)
+            if hit:
+                return json.loads(hit)
+        except Exception as e:
+            log.debug(f"symbols cache read failed: {e}")
+
+    pool = _pg_pool()
+    conn = pool.getconn()
     try:
         with conn.cursor() as cur:
-            cur.execute("SELECT DISTINCT symbol FROM ticks")
+            cur.execute(_DISTINCT_TICK_SYMBOLS_SQL)
             rows = cur.fetchall()
-            return [r[0] for r in rows]
+            symbols = [r[0] for r in rows]
     finally:
-        conn.close()
+        conn.rollback()
+        pool.putconn(conn)
+
+    if cache is not None:
+        try:
+            cache.set(SYMBOLS_CACHE_KEY, json.dumps(symbols), ex=SYMBOLS_CACHE_TTL)
+        except Exception as e:
+            log.debug(f"symbols cache write failed: {e}")
+    return symbols
+
+# (path) -> ((st_mtime_ns, st_size), parsed); re-parsed only when the file changes
+_JSON_CACHE: dict[str, tuple[tuple[int, int], dict]] = {}
+
+def _load_json_cached(path: str) -> dict:
+    """
+    Parse a JSON file, reusing the previous result while its mtime/size are
+    unchanged. The returned dict is shared between callers: treat it as read-only.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _JSON_CACHE.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    with open(path, "rb") as f:
+        buf = f.read()
+    data = orjson.loads(buf) if orjson is not None else json.loads(buf)
+    _JSON_CACHE[path] = (key, data)
+    return data
 
 def load_lifecycle_flags(path: str = FLAGS_PATH) -> dict:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _load_json_cached(path)
     except Exception as e:
         log.error(f"[❌] Failed to load lifecycle_flags.json: {e}")
         return {}
 
 def load_json_config(path: str = CONFIG_PATH) -> dict:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _load_json_cached(path)
     except Exception as e:
         log.error(f"[❌] Failed to load config.json: {e}")
         return {}
@@ -1,24 +1,27 @@
 # common/db_access.py
 from __future__ import annotations
 from datetime import datetime
+from itertools import starmap
 from typing import List
 from .dbutils import query_all
 from .schema import T_MINUTE, T_DAILY, T_TICKS, T_QUOTES, MinuteBar, DailyBar, Tick, Quote
 
+# LIMIT is always a bound parameter (NULL = no limit) so each query has a single
+# statement shape that psycopg can auto-prepare and reuse.
+# Rows are fetched as tuples (no per-row dict) and the SELECT column order
+# matches the dataclass field order, so records are built positionally.
+
 def get_minute_bars(symbol: str, start: datetime, end: datetime, limit: int | None = None) -> List[MinuteBar]:
-    limit_clause = "LIMIT %s" if limit else ""
     q = f"""
         SELECT symbol, ts_utc, open, high, low, close, volume, vwap, trades
         FROM {T_MINUTE}
         WHERE symbol=%s AND ts_utc BETWEEN %s AND %s
         ORDER BY ts_utc ASC
-        {limit_clause}
+        LIMIT %s
     """
-    params = [symbol, start, end]
-    if limit:
-        params.append(limit)
-    rows = query_all(q, params)
-    return [MinuteBar(**r) for r in rows]
+    params = [symbol, start, end, limit or None]
+    rows = query_all(q, params, as_dict=False)
+    return list(starmap(MinuteBar, rows))
 
 def get_daily_bars(symbol: str, start: datetime, end: datetime) -> List[DailyBar]:
     q = f"""
@@ -27,35 +30,29 @@ def get_daily_bars(symbol: str, start: datetime, end: datetime) -> List[DailyBar
         WHERE symbol=%s AND session_date BETWEEN %s AND %s
         ORDER BY session_date ASC
     """
-    rows = query_all(q, [symbol, start, end])
-    return [DailyBar(**r) for r in rows]
+    rows = query_all(q, [symbol, start, end], as_dict=False)
+    return list(starmap(DailyBar, rows))
 
 def get_ticks(symbol: str, start: datetime, end: datetime, limit: int | None = None) -> List[Tick]:
-    limit_clause = "LIMIT %s" if limit else ""
     q = f"""
         SELECT symbol, ts_utc, price, size, exchange
         FROM {T_TICKS}
         WHERE symbol=%s AND ts_utc BETWEEN %s AND %s
         ORDER BY ts_utc ASC
-        {limit_clause}
+        LIMIT %s
     """
-    params = [symbol, start, end]
-    if limit:
-        params.append(limit)
-    rows = query_all(q, params)
-    return [Tick(**r) for r in rows]
+    params = [symbol, start, end, limit or None]
+    rows = query_all(q, params, as_dict=False)
+    return list(starmap(Tick, rows))
 
 def get_quotes(symbol: str, start: datetime, end: datetime, limit: int | None = None) -> List[Quote]:
-    limit_clause = "LIMIT %s" if limit else ""
     q = f"""
         SELECT symbol, ts_utc, bid, ask, bid_size, ask_size, exchange
         FROM {T_QUOTES}
         WHERE symbol=%s AND ts_utc BETWEEN %s AND %s
         ORDER BY ts_utc ASC
-        {limit_clause}
+        LIMIT %s
     """
-    params = [symbol, start, end]
-    if limit:
-        params.append(limit)
-    rows = query_all(q, params)
-    return [Quote(**r) for r in rows]
+    params = [symbol, start, end, limit or None]
+    rows = query_all(q, params, as_dict=False)
+    return list(starmap(Quote, rows))
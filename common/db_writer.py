@@ -45,15 +45,39 @@ Environment overrides (optional):
   REFLEX_COL_BID_EXCHANGE       default "bid_exchange"
   REFLEX_COL_ASK_EXCHANGE       default "ask_exchange"
   REFLEX_COL_QUOTE_CONDITIONS   default "conditions"  (array/json/text acceptable)
+
+  # write path
+  REFLEX_COPY_MIN_ROWS          default 5000  (batches this large use COPY + merge)
+
+chunk_size=None (default) sizes INSERT pages from the row width: as many rows as fit
+under Postgres' 65535 bind parameters per statement (e.g. 8191 rows at 8 columns).
 """
 
 from __future__ import annotations
 
 import os
-from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import psycopg
+from psycopg.types.datetime import DatetimeBinaryDumper, DatetimeDumper
+
+from .dbutils import bulk_upsert, copy_upsert, get_pool
 
-from .dbutils import bulk_upsert
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 # --------------------------------------------------------------------------------------
 # Table / Column config with safe defaults to match hypertable names:
@@ -95,167 +119,446 @@ COL_BID_EXCH  = os.getenv("REFLEX_COL_BID_EXCHANGE", "bid_exchange")
 COL_ASK_EXCH  = os.getenv("REFLEX_COL_ASK_EXCHANGE", "ask_exchange")
 COL_QT_COND   = os.getenv("REFLEX_COL_QUOTE_CONDITIONS","conditions")
 
+# Batches at least this large go through COPY + merge instead of INSERT
+COPY_MIN_ROWS = int(os.getenv("REFLEX_COPY_MIN_ROWS", "5000"))
+
 
 # --------------------------------------------------------------------------------------
 # Time helpers
 # --------------------------------------------------------------------------------------
+# Epoch unit is classified by magnitude without branching:
+# index = (t > ms) + (t > ns) -> 0=seconds, 1=milliseconds, 2=nanoseconds.
+_MS_THRESHOLD = 10**11
+_NS_THRESHOLD = 10**14
+_TO_SECONDS = (1, 1e-3, 1e-9)
+
 def _epoch_to_dt_utc(t: int | float) -> datetime:
     """
     Convert epoch seconds/milliseconds/nanoseconds to UTC datetime.
     """
     if t is None:
         raise ValueError("Missing epoch timestamp value")
-    if t > 1e14:    # ns
-        seconds = t / 1e9
-    elif t > 1e11:  # ms
-        seconds = t / 1e3
-    else:           # s
-        seconds = t
-    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+    return datetime.fromtimestamp(
+        t * _TO_SECONDS[(t > _MS_THRESHOLD) + (t > _NS_THRESHOLD)], tz=timezone.utc
+    )
 
 def _minute_floor(dt: datetime) -> datetime:
     return dt.replace(second=0, microsecond=0)
 
+def _epoch_to_date(t: int | float):
+    return _epoch_to_dt_utc(t).date()
+
+
+# Epoch timestamps headed for TIMESTAMPTZ columns skip datetime entirely: the
+# mappers emit EpochUs (epoch microseconds) and the dumpers registered below
+# write it straight to the wire (binary: int8 offset from the 2000-01-01 PG epoch).
+_US_PER_MINUTE = 60_000_000
+_PG_EPOCH_US = 946_684_800_000_000
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_pack_int8 = struct.Struct("!q").pack
+
+class EpochUs(int):
+    """Epoch microseconds (UTC) bound for a TIMESTAMPTZ column."""
+    __slots__ = ()
+
+    def to_datetime(self) -> datetime:
+        return _UNIX_EPOCH + timedelta(microseconds=int(self))
+
+def _epoch_to_us(t: int | float) -> EpochUs:
+    """Convert epoch seconds/milliseconds/nanoseconds to EpochUs."""
+    if t is None:
+        raise ValueError("Missing epoch timestamp value")
+    if t > _NS_THRESHOLD:
+        return EpochUs(int(t) // 1_000)  # integer math: ns epochs exceed float precision
+    if t > _MS_THRESHOLD:
+        return EpochUs(int(t * 1_000))
+    return EpochUs(int(t * 1_000_000))
+
+def _epoch_to_minute_us(t: int | float) -> EpochUs:
+    us = _epoch_to_us(t)
+    return EpochUs(us - us % _US_PER_MINUTE)
+
+
+class _EpochUsBinaryDumper(DatetimeBinaryDumper):
+    # Also registered as the TIMESTAMPTZ-by-oid dumper (binary COPY picks dumpers
+    # by column type), so real datetimes must keep going through the base class.
+    def get_key(self, obj, format):
+        return self.cls if type(obj) is EpochUs else super().get_key(obj, format)
+
+    def upgrade(self, obj, format):
+        return self if type(obj) is EpochUs else super().upgrade(obj, format)
+
+    def dump(self, obj):
+        if type(obj) is EpochUs:
+            return _pack_int8(obj - _PG_EPOCH_US)
+        return super().dump(obj)
+
+class _EpochUsTextDumper(DatetimeDumper):
+    def get_key(self, obj, format):
+        return self.cls if type(obj) is EpochUs else super().get_key(obj, format)
+
+    def upgrade(self, obj, format):
+        return self if type(obj) is EpochUs else super().upgrade(obj, format)
+
+    def dump(self, obj):
+        if type(obj) is EpochUs:
+            obj = obj.to_datetime()
+        return super().dump(obj)
+
+psycopg.adapters.register_dumper(EpochUs, _EpochUsTextDumper)
+psycopg.adapters.register_dumper(EpochUs, _EpochUsBinaryDumper)
+
+
+# --------------------------------------------------------------------------------------
+# Row layouts: mappers emit positional tuples in this column order (no per-row dict).
+# Columns after the first *_REQUIRED entries are optional; a batch writes them only
+# if its first row carries them, and a NULL in a later row keeps the stored value.
+# --------------------------------------------------------------------------------------
+DAILY_COLS  = (COL_SYMBOL, COL_DAILY_TS, COL_OPEN, COL_HIGH, COL_LOW, COL_CLOSE, COL_VOLUME, COL_VWAP)
+MINUTE_COLS = (COL_SYMBOL, COL_MINUTE_TS, COL_OPEN, COL_HIGH, COL_LOW, COL_CLOSE, COL_VOLUME, COL_VWAP)
+TICK_COLS   = (COL_SYMBOL, COL_TICK_TS, COL_PRICE, COL_SIZE, COL_EXCHANGE, COL_TK_COND)
+QUOTE_COLS  = (COL_SYMBOL, COL_QUOTE_TS, COL_BID_PRICE, COL_BID_SIZE, COL_ASK_PRICE, COL_ASK_SIZE,
+               COL_BID_EXCH, COL_ASK_EXCH, COL_QT_COND)
+DAILY_REQUIRED  = 7
+MINUTE_REQUIRED = 7
+TICK_REQUIRED   = 4
+QUOTE_REQUIRED  = 6
+
+
+# Named views of the layouts above (field order == *_COLS order). Mappers build
+# plain tuples, which are the same size but several times cheaper to construct;
+# use e.g. TickRow._make(t) where named access is wanted off the hot path.
+class BarRow(NamedTuple):
+    symbol: str
+    ts: Any            # date (daily) / datetime or EpochUs (minute)
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    vwap: Optional[float]
+
+class TickRow(NamedTuple):
+    symbol: str
+    ts: Any            # datetime or EpochUs
+    price: float
+    size: int
+    exchange: Optional[int]
+    conditions: Optional[Any]
+
+class QuoteRow(NamedTuple):
+    symbol: str
+    ts: Any            # datetime or EpochUs
+    bid_price: float
+    bid_size: int
+    ask_price: float
+    ask_size: int
+    bid_exchange: Optional[int]
+    ask_exchange: Optional[int]
+    conditions: Optional[Any]
+
+assert len(BarRow._fields) == len(DAILY_COLS) == len(MINUTE_COLS)
+assert len(TickRow._fields) == len(TICK_COLS)
+assert len(QuoteRow._fields) == len(QUOTE_COLS)
+
 
 # --------------------------------------------------------------------------------------
 # Mapping helpers (accept Polygon-style or DB-native rows)
 # --------------------------------------------------------------------------------------
-def _map_daily_row(row: Mapping[str, Any], *, symbol: str) -> Dict[str, Any]:
-    o = row.get(COL_OPEN,  row.get("o"))
-    h = row.get(COL_HIGH,  row.get("h"))
-    l = row.get(COL_LOW,   row.get("l"))
-    c = row.get(COL_CLOSE, row.get("c"))
-    v = row.get(COL_VOLUME,row.get("v"))
-    vw = row.get(COL_VWAP, row.get("vw", row.get("vwap")))
+# Column names are bound as keyword defaults so the per-row lookups are LOAD_FAST
+# locals instead of module-global loads (the env values never change after import).
+def _map_daily_row(
+    row: Mapping[str, Any], *, symbol: str,
+    _o=COL_OPEN, _h=COL_HIGH, _l=COL_LOW, _c=COL_CLOSE, _v=COL_VOLUME, _vw=COL_VWAP,
+    _ts=COL_DAILY_TS, _epoch=_epoch_to_date,
+) -> tuple:
+    get = row.get
+    o = get(_o,  get("o"))
+    h = get(_h,  get("h"))
+    l = get(_l,  get("l"))
+    c = get(_c,  get("c"))
+    v = get(_v,  get("v"))
+    vw = get(_vw, get("vw", get("vwap")))
     if None in (o, h, l, c, v):
-        missing = [k for k, v_ in [(COL_OPEN,o),(COL_HIGH,h),(COL_LOW,l),(COL_CLOSE,c),(COL_VOLUME,v)] if v_ is None]
+        missing = [k for k, v_ in [(_o,o),(_h,h),(_l,l),(_c,c),(_v,v)] if v_ is None]
         raise ValueError(f"Daily bar row missing fields: {missing}")
 
-    if COL_DAILY_TS in row:
-        day_val = row[COL_DAILY_TS]
+    if _ts in row:
+        day_val = row[_ts]
     elif "day" in row:
         day_val = row["day"]
     elif "t" in row:
-        day_val = _epoch_to_dt_utc(row["t"]).date()
+        day_val = _epoch(row["t"])
     else:
-        raise ValueError(f"Daily bar row missing {COL_DAILY_TS}/'day' or epoch 't'")
-
-    out = {
-        COL_SYMBOL: symbol,
-        COL_DAILY_TS: day_val,
-        COL_OPEN: o, COL_HIGH: h, COL_LOW: l, COL_CLOSE: c, COL_VOLUME: v
-    }
-    if vw is not None:
-        out[COL_VWAP] = vw
-    return out
-
-
-def _map_minute_row(row: Mapping[str, Any], *, symbol: str) -> Dict[str, Any]:
-    o = row.get(COL_OPEN,  row.get("o"))
-    h = row.get(COL_HIGH,  row.get("h"))
-    l = row.get(COL_LOW,   row.get("l"))
-    c = row.get(COL_CLOSE, row.get("c"))
-    v = row.get(COL_VOLUME,row.get("v"))
-    vw = row.get(COL_VWAP, row.get("vw", row.get("vwap")))
+        raise ValueError(f"Daily bar row missing {_ts}/'day' or epoch 't'")
+
+    return (symbol, day_val, o, h, l, c, v, vw)
+
+
+def _map_minute_row(
+    row: Mapping[str, Any], *, symbol: str,
+    _o=COL_OPEN, _h=COL_HIGH, _l=COL_LOW, _c=COL_CLOSE, _v=COL_VOLUME, _vw=COL_VWAP,
+    _ts=COL_MINUTE_TS, _epoch=_epoch_to_minute_us,
+) -> tuple:
+    get = row.get
+    o = get(_o,  get("o"))
+    h = get(_h,  get("h"))
+    l = get(_l,  get("l"))
+    c = get(_c,  get("c"))
+    v = get(_v,  get("v"))
+    vw = get(_vw, get("vw", get("vwap")))
     if None in (o, h, l, c, v):
-        missing = [k for k, v_ in [(COL_OPEN,o),(COL_HIGH,h),(COL_LOW,l),(COL_CLOSE,c),(COL_VOLUME,v)] if v_ is None]
+        missing = [k for k, v_ in [(_o,o),(_h,h),(_l,l),(_c,c),(_v,v)] if v_ is None]
         raise ValueError(f"Minute bar row missing fields: {missing}")
 
-    if COL_MINUTE_TS in row:
-        ts_val = row[COL_MINUTE_TS]
+    if _ts in row:
+        ts_val = row[_ts]
     elif "ts" in row:
         ts_val = row["ts"]
     elif "t" in row:
-        ts_val = _minute_floor(_epoch_to_dt_utc(row["t"]))
+        ts_val = _epoch(row["t"])
     else:
-        raise ValueError(f"Minute bar row missing {COL_MINUTE_TS}/'ts' or epoch 't'")
-
-    out = {
-        COL_SYMBOL: symbol,
-        COL_MINUTE_TS: ts_val,
-        COL_OPEN: o, COL_HIGH: h, COL_LOW: l, COL_CLOSE: c, COL_VOLUME: v
-    }
-    if vw is not None:
-        out[COL_VWAP] = vw
-    return out
-
-
-def _map_tick_row(row: Mapping[str, Any], *, symbol: str) -> Dict[str, Any]:
-    price = row.get(COL_PRICE, row.get("p"))
-    size  = row.get(COL_SIZE,  row.get("s"))
-    exch  = row.get(COL_EXCHANGE, row.get("x"))
-    cond  = row.get(COL_TK_COND,  row.get("c"))
+        raise ValueError(f"Minute bar row missing {_ts}/'ts' or epoch 't'")
+
+    return (symbol, ts_val, o, h, l, c, v, vw)
+
+
+def _map_tick_row(
+    row: Mapping[str, Any], *, symbol: str,
+    _p=COL_PRICE, _s=COL_SIZE, _x=COL_EXCHANGE, _cond=COL_TK_COND,
+    _ts=COL_TICK_TS, _epoch=_epoch_to_us,
+) -> tuple:
+    get = row.get
+    price = get(_p, get("p"))
+    size  = get(_s, get("s"))
+    exch  = get(_x, get("x"))
+    cond  = get(_cond, get("c"))
     if price is None or size is None:
-        missing = [k for k, v_ in [(COL_PRICE,price),(COL_SIZE,size)] if v_ is None]
+        missing = [k for k, v_ in [(_p,price),(_s,size)] if v_ is None]
         raise ValueError(f"Tick row missing fields: {missing}")
 
-    if COL_TICK_TS in row:
-        ts_val = row[COL_TICK_TS]
+    if _ts in row:
+        ts_val = row[_ts]
     elif "ts" in row:
         ts_val = row["ts"]
     elif "t" in row:
-        ts_val = _epoch_to_dt_utc(row["t"])
+        ts_val = _epoch(row["t"])
     else:
-        raise ValueError(f"Tick row missing {COL_TICK_TS}/'ts' or epoch 't'")
-
-    out = {
-        COL_SYMBOL: symbol,
-        COL_TICK_TS: ts_val,
-        COL_PRICE: price,
-        COL_SIZE: size
-    }
-    if exch is not None:
-        out[COL_EXCHANGE] = exch
-    if cond is not None:
-        out[COL_TK_COND] = cond
-    return out
-
-
-def _map_quote_row(row: Mapping[str, Any], *, symbol: str) -> Dict[str, Any]:
-    bp = row.get(COL_BID_PRICE, row.get("bp"))
-    bs = row.get(COL_BID_SIZE,  row.get("bs"))
-    ap = row.get(COL_ASK_PRICE, row.get("ap"))
-    asz= row.get(COL_ASK_SIZE,  row.get("as"))
-    bx = row.get(COL_BID_EXCH,  row.get("bx"))
-    ax = row.get(COL_ASK_EXCH,  row.get("ax"))
-    cond = row.get(COL_QT_COND, row.get("c"))
+        raise ValueError(f"Tick row missing {_ts}/'ts' or epoch 't'")
+
+    return (symbol, ts_val, price, size, exch, cond)
+
+
+def _map_quote_row(
+    row: Mapping[str, Any], *, symbol: str,
+    _bp=COL_BID_PRICE, _bs=COL_BID_SIZE, _ap=COL_ASK_PRICE, _as=COL_ASK_SIZE,
+    _bx=COL_BID_EXCH, _ax=COL_ASK_EXCH, _cond=COL_QT_COND,
+    _ts=COL_QUOTE_TS, _epoch=_epoch_to_us,
+) -> tuple:
+    get = row.get
+    bp = get(_bp, get("bp"))
+    bs = get(_bs, get("bs"))
+    ap = get(_ap, get("ap"))
+    asz= get(_as, get("as"))
+    bx = get(_bx, get("bx"))
+    ax = get(_ax, get("ax"))
+    cond = get(_cond, get("c"))
 
     # bid/ask prices and sizes are typically required
     if bp is None or bs is None or ap is None or asz is None:
-        missing = [k for k, v_ in [(COL_BID_PRICE,bp),(COL_BID_SIZE,bs),(COL_ASK_PRICE,ap),(COL_ASK_SIZE,asz)] if v_ is None]
+        missing = [k for k, v_ in [(_bp,bp),(_bs,bs),(_ap,ap),(_as,asz)] if v_ is None]
         raise ValueError(f"Quote row missing fields: {missing}")
 
-    if COL_QUOTE_TS in row:
-        ts_val = row[COL_QUOTE_TS]
+    if _ts in row:
+        ts_val = row[_ts]
     elif "ts" in row:
         ts_val = row["ts"]
     elif "t" in row:
-        ts_val = _epoch_to_dt_utc(row["t"])
+        ts_val = _epoch(row["t"])
     else:
-        raise ValueError(f"Quote row missing {COL_QUOTE_TS}/'ts' or epoch 't'")
-
-    out = {
-        COL_SYMBOL: symbol,
-        COL_QUOTE_TS: ts_val,
-        COL_BID_PRICE: bp,
-        COL_BID_SIZE: bs,
-        COL_ASK_PRICE: ap,
-        COL_ASK_SIZE: asz,
-    }
-    if bx is not None:
-        out[COL_BID_EXCH] = bx
-    if ax is not None:
-        out[COL_ASK_EXCH] = ax
-    if cond is not None:
-        out[COL_QT_COND] = cond
-    return out
+        raise ValueError(f"Quote row missing {_ts}/'ts' or epoch 't'")
+
+    return (symbol, ts_val, bp, bs, ap, asz, bx, ax, cond)
+
+
+# --------------------------------------------------------------------------------------
+# Shape-specialized mappers: the generic mappers above resolve key aliases and the
+# timestamp source on every row. A batch almost always has one row shape, so the
+# first row's keys pick the aliases once and a straight-line mapper is generated
+# with the keys inlined as constants. Rows lacking one of those keys (or with a
+# missing required value) are handed to the generic mapper, which owns the errors.
+# --------------------------------------------------------------------------------------
+# generic mapper -> (value fields as alias tuples in layout order, direct ts keys,
+#                    converter for epoch 't', required value count)
+_MAPPER_SPECS = {
+    _map_daily_row: (
+        ((COL_OPEN, "o"), (COL_HIGH, "h"), (COL_LOW, "l"), (COL_CLOSE, "c"),
+         (COL_VOLUME, "v"), (COL_VWAP, "vw", "vwap")),
+        (COL_DAILY_TS, "day"), _epoch_to_date, DAILY_REQUIRED - 2,
+    ),
+    _map_minute_row: (
+        ((COL_OPEN, "o"), (COL_HIGH, "h"), (COL_LOW, "l"), (COL_CLOSE, "c"),
+         (COL_VOLUME, "v"), (COL_VWAP, "vw", "vwap")),
+        (COL_MINUTE_TS, "ts"), _epoch_to_minute_us, MINUTE_REQUIRED - 2,
+    ),
+    _map_tick_row: (
+        ((COL_PRICE, "p"), (COL_SIZE, "s"), (COL_EXCHANGE, "x"), (COL_TK_COND, "c")),
+        (COL_TICK_TS, "ts"), _epoch_to_us, TICK_REQUIRED - 2,
+    ),
+    _map_quote_row: (
+        ((COL_BID_PRICE, "bp"), (COL_BID_SIZE, "bs"), (COL_ASK_PRICE, "ap"), (COL_ASK_SIZE, "as"),
+         (COL_BID_EXCH, "bx"), (COL_ASK_EXCH, "ax"), (COL_QT_COND, "c")),
+        (COL_QUOTE_TS, "ts"), _epoch_to_us, QUOTE_REQUIRED - 2,
+    ),
+}
+
+# (generic mapper, frozenset(row keys)) -> specialized mapper
+_SPECIALIZED: dict = {}
+_SPECIALIZED_MAX = 256
+
+
+def _build_specialized(generic, keys: frozenset):
+    fields, ts_keys, from_epoch, n_required = _MAPPER_SPECS[generic]
+
+    def pick(aliases):
+        return next((k for k in aliases if k in keys), None)
+
+    ts_key = pick(ts_keys)
+    if ts_key is not None:
+        ts_src = f"r[{ts_key!r}]"
+    elif "t" in keys:
+        ts_src = "_epoch(r['t'])"
+    else:
+        return generic
+
+    values = []
+    for i, aliases in enumerate(fields):
+        k = pick(aliases)
+        if k is None:
+            if i < n_required:
+                return generic  # the generic mapper raises the proper error
+            values.append("None")
+        else:
+            values.append(f"r[{k!r}]")
+
+    # Shape guard is the KeyError from the inlined lookups; null checks are unrolled.
+    null_check = " or ".join(f"t[{2 + i}] is None" for i in range(n_required))
+    src = (
+        "def _mapper(r, *, symbol):\n"
+        "    try:\n"
+        f"        t = (symbol, {ts_src}, {', '.join(values)})\n"
+        "    except KeyError:\n"
+        "        return _slow(r, symbol=symbol)\n"
+        f"    if {null_check}:\n"
+        "        return _slow(r, symbol=symbol)\n"
+        "    return t\n"
+    )
+    ns = {"_slow": generic, "_epoch": from_epoch}
+    exec(src, ns)
+    return ns["_mapper"]
+
+
+def _specialized_mapper(generic, first_row: Mapping[str, Any]):
+    """Return a mapper specialized to first_row's shape (generic if not applicable)."""
+    if generic not in _MAPPER_SPECS or not isinstance(first_row, dict):
+        return generic
+    key = (generic, frozenset(first_row))
+    fn = _SPECIALIZED.get(key)
+    if fn is None:
+        fn = _build_specialized(generic, key[1])
+        if len(_SPECIALIZED) < _SPECIALIZED_MAX:
+            _SPECIALIZED[key] = fn
+    return fn
+
+
+# --------------------------------------------------------------------------------------
+# Columnar mapping (arrays in, TICK_COLS tuples out; no per-row dict dispatch)
+# --------------------------------------------------------------------------------------
+def _epochs_to_us_array(ts) -> "np.ndarray":
+    """Vectorized epoch s/ms/ns (or datetimes; naive = UTC) -> int64 epoch microseconds."""
+    t = ts if hasattr(ts, "dtype") else np.asarray(ts)
+    if t.dtype.kind not in "iuf":
+        # datetime64 (naive or tz-aware) or an object column of datetimes
+        if pd is None:
+            raise RuntimeError("pandas not installed; pip install pandas")
+        dt = pd.to_datetime(pd.Series(t), utc=True)
+        if dt.isna().any():
+            raise ValueError(f"Tick timestamps have {int(dt.isna().sum())} NaT values")
+        return dt.dt.tz_convert(None).to_numpy("datetime64[us]").astype(np.int64)
+    t = t.astype(np.int64) if t.dtype.kind in "iu" else t.astype(np.float64)
+    us = np.where(t > _NS_THRESHOLD, t // 1_000,
+                  np.where(t > _MS_THRESHOLD, t * 1_000, t * 1_000_000))
+    return us.astype(np.int64)
+
+
+def _map_ticks_arrays(symbol: str, ts, prices, sizes, exchanges=None, conditions=None) -> List[tuple]:
+    """
+    Columnar counterpart of _map_tick_row: epoch normalization and null checks run
+    as NumPy array ops, and rows are zipped together in C.
+    """
+    if np is None:
+        raise RuntimeError("numpy not installed; pip install numpy")
+    price = np.asarray(prices, dtype=np.float64)
+    size = np.asarray(sizes, dtype=np.float64)
+    bad = np.isnan(price) | np.isnan(size)
+    if bad.any():
+        raise ValueError(f"Tick arrays have {int(bad.sum())} rows missing price/size")
+    us = _epochs_to_us_array(ts)
+    n = len(us)
+    ts_list = list(map(EpochUs, us.tolist()))
+    none = [None] * n
+    exch = list(exchanges) if exchanges is not None else none
+    cond = list(conditions) if conditions is not None else none
+    return list(zip([symbol] * n, ts_list, price.tolist(), size.astype(np.int64).tolist(), exch, cond))
 
 
 # --------------------------------------------------------------------------------------
 # Normalizers
 # --------------------------------------------------------------------------------------
-def _normalize(rows: Iterable[Mapping[str, Any]], mapper, *, symbol: str) -> List[Dict[str, Any]]:
-    return [mapper(r, symbol=symbol) for r in rows]
+def _normalize(
+    rows: Iterable[Mapping[str, Any]], mapper, cols: Sequence[str], n_required: int, *, symbol: str
+) -> Tuple[Tuple[str, ...], Tuple[str, ...], Iterator[tuple]]:
+    """
+    Map rows to value tuples lazily. Returns (columns, optional columns kept, iterator).
+    Only the first row is mapped up front; optional columns absent from it are
+    dropped for the whole batch.
+    """
+    it = iter(rows)
+    first = next(it, None)
+    if first is None:
+        return (), (), iter(())
+    mapper = _specialized_mapper(mapper, first)
+    head = mapper(first, symbol=symbol)
+    keep = [i for i in range(len(cols)) if i < n_required or head[i] is not None]
+    kept_optional = tuple(cols[i] for i in keep[n_required:])
+    mapped = (mapper(r, symbol=symbol) for r in it)
+    if len(keep) == len(cols):
+        return tuple(cols), kept_optional, chain((head,), mapped)
+    pick = itemgetter(*keep)
+    return tuple(cols[i] for i in keep), kept_optional, chain((pick(head),), map(pick, mapped))
+
+
+def _upsert(table, layout, mapper, n_required, conflict, symbol, rows, *, dsn, update_cols, chunk_size) -> int:
+    cols, optional, norm = _normalize(rows, mapper, layout, n_required, symbol=symbol)
+    if not cols:
+        return 0
+    if update_cols is None:
+        conflict_set = frozenset(conflict)
+        update_cols = tuple(c for c in cols if c not in conflict_set)
+    # Map only as far as needed to pick the write path; big batches keep
+    # streaming from the mapper into COPY.
+    head = list(islice(norm, COPY_MIN_ROWS))
+    if len(head) >= COPY_MIN_ROWS:
+        return copy_upsert(
+            table, cols, chain(head, norm),
+            conflict_cols=conflict, update_cols=update_cols,
+            coalesce_cols=optional, dsn=dsn
+        )
+    return bulk_upsert(
+        table, cols, head,
+        conflict_cols=conflict, update_cols=update_cols,
+        coalesce_cols=optional, dsn=dsn, chunk_size=chunk_size
+    )
 
 
 # --------------------------------------------------------------------------------------
@@ -267,19 +570,11 @@ def upsert_daily_bars_for_symbol(
     *,
     dsn: Optional[str] = None,
     update_cols: Optional[Sequence[str]] = None,
-    chunk_size: int = 1000,
+    chunk_size: Optional[int] = None,
 ) -> int:
-    norm = _normalize(rows, _map_daily_row, symbol=symbol)
-    if not norm:
-        return 0
-    cols = list(norm[0].keys())
-    conflict = [COL_SYMBOL, COL_DAILY_TS]
-    if update_cols is None:
-        update_cols = [c for c in cols if c not in conflict]
-    return bulk_upsert(
-        TABLE_DAILY, cols, norm,
-        conflict_cols=conflict, update_cols=update_cols,
-        dsn=dsn, chunk_size=chunk_size
+    return _upsert(
+        TABLE_DAILY, DAILY_COLS, _map_daily_row, DAILY_REQUIRED, [COL_SYMBOL, COL_DAILY_TS],
+        symbol, rows, dsn=dsn, update_cols=update_cols, chunk_size=chunk_size
     )
 
 
@@ -289,19 +584,11 @@ def upsert_minute_bars_for_symbol(
     *,
     dsn: Optional[str] = None,
     update_cols: Optional[Sequence[str]] = None,
-    chunk_size: int = 2000,
+    chunk_size: Optional[int] = None,
 ) -> int:
-    norm = _normalize(rows, _map_minute_row, symbol=symbol)
-    if not norm:
-        return 0
-    cols = list(norm[0].keys())
-    conflict = [COL_SYMBOL, COL_MINUTE_TS]
-    if update_cols is None:
-        update_cols = [c for c in cols if c not in conflict]
-    return bulk_upsert(
-        TABLE_MINUTE, cols, norm,
-        conflict_cols=conflict, update_cols=update_cols,
-        dsn=dsn, chunk_size=chunk_size
+    return _upsert(
+        TABLE_MINUTE, MINUTE_COLS, _map_minute_row, MINUTE_REQUIRED, [COL_SYMBOL, COL_MINUTE_TS],
+        symbol, rows, dsn=dsn, update_cols=update_cols, chunk_size=chunk_size
     )
 
 
@@ -311,19 +598,11 @@ def upsert_ticks_for_symbol(
     *,
     dsn: Optional[str] = None,
     update_cols: Optional[Sequence[str]] = None,
-    chunk_size: int = 5000,
+    chunk_size: Optional[int] = None,
 ) -> int:
-    norm = _normalize(rows, _map_tick_row, symbol=symbol)
-    if not norm:
-        return 0
-    cols = list(norm[0].keys())
-    conflict = [COL_SYMBOL, COL_TICK_TS]
-    if update_cols is None:
-        update_cols = [c for c in cols if c not in conflict]
-    return bulk_upsert(
-        TABLE_TICK, cols, norm,
-        conflict_cols=conflict, update_cols=update_cols,
-        dsn=dsn, chunk_size=chunk_size
+    return _upsert(
+        TABLE_TICK, TICK_COLS, _map_tick_row, TICK_REQUIRED, [COL_SYMBOL, COL_TICK_TS],
+        symbol, rows, dsn=dsn, update_cols=update_cols, chunk_size=chunk_size
     )
 
 
@@ -333,25 +612,115 @@ def upsert_quotes_for_symbol(
     *,
     dsn: Optional[str] = None,
     update_cols: Optional[Sequence[str]] = None,
-    chunk_size: int = 5000,
+    chunk_size: Optional[int] = None,
+) -> int:
+    return _upsert(
+        TABLE_QUOTE, QUOTE_COLS, _map_quote_row, QUOTE_REQUIRED, [COL_SYMBOL, COL_QUOTE_TS],
+        symbol, rows, dsn=dsn, update_cols=update_cols, chunk_size=chunk_size
+    )
+
+
+def upsert_ticks_from_frame(
+    symbol: str,
+    frame: Any,
+    *,
+    dsn: Optional[str] = None,
+    update_cols: Optional[Sequence[str]] = None,
+    chunk_size: Optional[int] = None,
 ) -> int:
-    norm = _normalize(rows, _map_quote_row, symbol=symbol)
+    """
+    Columnar fast path for ticks: `frame` is a DataFrame (or mapping of arrays) with
+    a timestamp column (COL_TICK_TS/'ts' datetimes, naive = UTC, or epoch 't') plus price/size
+    (COL_*/'p'/'s'); exchange/conditions are optional. Skips the per-row mappers.
+    """
+    names = set(frame.columns) if hasattr(frame, "columns") else set(frame.keys())
+
+    def col(*aliases, required=True):
+        for a in aliases:
+            if a in names:
+                return frame[a]
+        if required:
+            raise ValueError(f"Tick frame missing column: one of {aliases}")
+        return None
+
+    exch = col(COL_EXCHANGE, "x", required=False)
+    cond = col(COL_TK_COND, "c", required=False)
+    norm = _map_ticks_arrays(
+        symbol, col(COL_TICK_TS, "ts", "t"), col(COL_PRICE, "p"), col(COL_SIZE, "s"), exch, cond
+    )
     if not norm:
         return 0
-    cols = list(norm[0].keys())
-    conflict = [COL_SYMBOL, COL_QUOTE_TS]
+    keep = [i for i in range(len(TICK_COLS))
+            if i < TICK_REQUIRED or (exch, cond)[i - TICK_REQUIRED] is not None]
+    cols = tuple(TICK_COLS[i] for i in keep)
+    if len(keep) < len(TICK_COLS):
+        norm = list(map(itemgetter(*keep), norm))
+    conflict = [COL_SYMBOL, COL_TICK_TS]
     if update_cols is None:
-        update_cols = [c for c in cols if c not in conflict]
-    return bulk_upsert(
-        TABLE_QUOTE, cols, norm,
+        update_cols = tuple(c for c in cols if c not in conflict)
+    # without exchange/conditions every value was built here (str, EpochUs, float,
+    # int), so both write paths can send them in binary
+    binary = exch is None and cond is None
+    write = partial(copy_upsert, binary=binary) if len(norm) >= COPY_MIN_ROWS else partial(
+        bulk_upsert, chunk_size=chunk_size, binary=binary
+    )
+    return write(
+        TABLE_TICK, cols, norm,
         conflict_cols=conflict, update_cols=update_cols,
-        dsn=dsn, chunk_size=chunk_size
+        coalesce_cols=cols[TICK_REQUIRED:], dsn=dsn
     )
 
 
+# --------------------------------------------------------------------------------------
+# Multi-symbol variants: symbols are independent, so each one is written by a
+# worker thread on its own connection/transaction and the round-trips overlap.
+# --------------------------------------------------------------------------------------
+def _pool_capacity() -> Optional[int]:
+    try:
+        return get_pool().max_size
+    except RuntimeError:
+        return None  # no dbutils pool; each worker opens its own connection
+
+
+def _upsert_many(upsert_one, symbol_rows: Mapping[str, Iterable[Mapping[str, Any]]], workers: int, **kwargs) -> Dict[str, int]:
+    if not symbol_rows:
+        return {}
+    cap = _pool_capacity()
+    n = max(1, min(workers, len(symbol_rows), cap or workers))
+    if n == 1:
+        return {sym: upsert_one(sym, rows, **kwargs) for sym, rows in symbol_rows.items()}
+    with ThreadPoolExecutor(max_workers=n, thread_name_prefix="reflex-upsert") as ex:
+        futs = {sym: ex.submit(upsert_one, sym, rows, **kwargs) for sym, rows in symbol_rows.items()}
+        return {sym: f.result() for sym, f in futs.items()}
+
+
+def upsert_daily_bars_bulk(symbol_rows: Mapping[str, Iterable[Mapping[str, Any]]], *, workers: int = 8, **kwargs) -> Dict[str, int]:
+    return _upsert_many(upsert_daily_bars_for_symbol, symbol_rows, workers, **kwargs)
+
+
+def upsert_minute_bars_bulk(symbol_rows: Mapping[str, Iterable[Mapping[str, Any]]], *, workers: int = 8, **kwargs) -> Dict[str, int]:
+    return _upsert_many(upsert_minute_bars_for_symbol, symbol_rows, workers, **kwargs)
+
+
+def upsert_ticks_bulk(symbol_rows: Mapping[str, Iterable[Mapping[str, Any]]], *, workers: int = 8, **kwargs) -> Dict[str, int]:
+    return _upsert_many(upsert_ticks_for_symbol, symbol_rows, workers, **kwargs)
+
+
+def upsert_quotes_bulk(symbol_rows: Mapping[str, Iterable[Mapping[str, Any]]], *, workers: int = 8, **kwargs) -> Dict[str, int]:
+    return _upsert_many(upsert_quotes_for_symbol, symbol_rows, workers, **kwargs)
+
+
 __all__ = [
     "upsert_daily_bars_for_symbol",
     "upsert_minute_bars_for_symbol",
     "upsert_ticks_for_symbol",
     "upsert_quotes_for_symbol",
-]
\ No newline at end of file
+    "upsert_ticks_from_frame",
+    "BarRow",
+    "TickRow",
+    "QuoteRow",
+    "upsert_daily_bars_bulk",
+    "upsert_minute_bars_bulk",
+    "upsert_ticks_bulk",
+    "upsert_quotes_bulk",
+]
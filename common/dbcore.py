@@ -1,42 +1,81 @@
 # common/dbcore.py
 from __future__ import annotations
 import contextlib
-import psycopg2
-from psycopg2 import pool
+import os
+from psycopg_pool import ConnectionPool, PoolTimeout
 from typing import Iterator, Optional
 from .creds import get_pg_dsn
 from .app_logging import get_logger
 
 log = get_logger("DBCore")
 
-# Simple global connection pool
-_POOL: Optional[pool.SimpleConnectionPool] = None
+# Global thread-safe connection pool (psycopg v3, same driver as dbutils)
+_POOL: Optional[ConnectionPool] = None
 
-def init_pool(minconn: int = 1, maxconn: int = 8) -> None:
+# libpq TCP keepalives: dead peers are detected in ~1 min instead of hanging a writer
+_CONN_KWARGS = {
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 3,
+    "tcp_user_timeout": 30000,  # ms
+}
+
+# Opt-in: REFLEX_PG_ASYNC_COMMIT=1 turns off synchronous_commit for pool sessions.
+# Commits return before the WAL flush; a crash can lose the last few hundred ms
+# of acknowledged writes (never corrupts). Suitable for re-fetchable backfill data.
+_ASYNC_COMMIT = os.getenv("REFLEX_PG_ASYNC_COMMIT", "").lower() in ("1", "true", "yes", "on")
+
+def _configure(conn) -> None:
+    if _ASYNC_COMMIT:
+        conn.execute("SET synchronous_commit = off")
+        conn.commit()
+
+def init_pool(minconn: Optional[int] = None, maxconn: int = 8, wait_timeout: float = 30.0) -> None:
+    """
+    Open the pool with all connections pre-established (minconn defaults to maxconn)
+    so the first concurrent writers don't pay connect/auth in-band.
+    """
     global _POOL
     if _POOL is None:
         dsn = get_pg_dsn()
-        _POOL = pool.SimpleConnectionPool(minconn, maxconn, dsn=dsn)
-        log.info("PostgreSQL pool initialized (%d..%d)", minconn, maxconn)
+        min_size = maxconn if minconn is None else minconn
+        _POOL = ConnectionPool(
+            conninfo=dsn,
+            min_size=min_size,
+            max_size=maxconn,
+            kwargs=_CONN_KWARGS,
+            configure=_configure,
+            open=True,
+        )
+        try:
+            _POOL.wait(timeout=wait_timeout)
+        except PoolTimeout:
+            log.warning("PostgreSQL pool still filling after %.0fs", wait_timeout)
+        log.info("PostgreSQL pool initialized (%d..%d)", min_size, maxconn)
 
 @contextlib.contextmanager
-def get_conn():
+def get_conn(autocommit: bool = False):
     """
     Context manager that returns a pooled connection.
-    Ensures autocommit behavior for admin/DDL heavy workflows in dbmanager.
+    Data-path callers get a transaction that commits once on clean exit
+    (rolls back on error); use get_admin_conn() for DDL/admin work.
     """
     if _POOL is None:
         init_pool()
     assert _POOL is not None
-    conn = _POOL.getconn()
-    try:
-        conn.autocommit = True
+    with _POOL.connection() as conn:
+        conn.autocommit = autocommit
+        yield conn
+
+@contextlib.contextmanager
+def get_admin_conn():
+    """Pooled connection in autocommit mode for admin/DDL heavy workflows in dbmanager."""
+    with get_conn(autocommit=True) as conn:
         yield conn
-    finally:
-        _POOL.putconn(conn)
 
 @contextlib.contextmanager
-def get_cursor():
-    with get_conn() as conn:
+def get_cursor(autocommit: bool = False):
+    with get_conn(autocommit=autocommit) as conn:
         with conn.cursor() as cur:
             yield cur
@@ -18,14 +18,22 @@ Env fallbacks:
   REFLEX_DB_SSLMODE / PGSSLMODE
   REFLEX_DB_OPTIONS / PGOPTIONS
   REFLEX_DB_APP_NAME
+  REFLEX_DB_POOL_MAX            (default pool max size, 10)
   REFLEX_LOG_LEVEL
 """
 
 from __future__ import annotations
 
 import os
+import re
 import logging
-from contextlib import contextmanager
+import functools
+import threading
+import uuid
+from decimal import Decimal, ROUND_HALF_UP
+from contextlib import contextmanager, nullcontext
+from itertools import chain, islice
+from operator import itemgetter
 from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
 # ---------------------- optional .env support ----------------------
@@ -38,6 +46,7 @@ except Exception:
 # ---------------------- psycopg v3 imports ------------------------
 import psycopg
 from psycopg import sql
+from psycopg.adapt import PyFormat
 from psycopg.rows import dict_row
 from psycopg.errors import Error as PsycopgError
 
@@ -73,23 +82,31 @@ logger = _build_logger()
 
 # ---------------------- config helpers -----------------------------
 
-def _lower_keys(d: Mapping[str, Any]) -> Dict[str, Any]:
+def _lower_keys(d: Mapping[str, Any]) -> Mapping[str, Any]:
+    """d with lowercased keys; d itself (read-only use) when they already are."""
+    if all(isinstance(k, str) and k.islower() for k in d):
+        return d
     return {str(k).lower(): v for k, v in d.items()}
 
+# concept -> (REFLEX_DB_* var, PG* var)
+_ENV_MAPPING: Dict[str, Tuple[Optional[str], Optional[str]]] = {
+    "host": ("REFLEX_DB_HOST", "PGHOST"),
+    "port": ("REFLEX_DB_PORT", "PGPORT"),
+    "dbname": ("REFLEX_DB_NAME", "PGDATABASE"),
+    "user": ("REFLEX_DB_USER", "PGUSER"),
+    "password": ("REFLEX_DB_PASSWORD", "PGPASSWORD"),
+    "sslmode": ("REFLEX_DB_SSLMODE", "PGSSLMODE"),
+    "options": ("REFLEX_DB_OPTIONS", "PGOPTIONS"),
+    "app_name": ("REFLEX_DB_APP_NAME", None),
+}
+
+@functools.lru_cache(maxsize=None)
 def _prefer_env(key: str, default: Optional[str] = None) -> Optional[str]:
-    """Prefer REFLEX_DB_* then PG* for a given concept."""
-    mapping = {
-        "host": ("REFLEX_DB_HOST", "PGHOST"),
-        "port": ("REFLEX_DB_PORT", "PGPORT"),
-        "dbname": ("REFLEX_DB_NAME", "PGDATABASE"),
-        "user": ("REFLEX_DB_USER", "PGUSER"),
-        "password": ("REFLEX_DB_PASSWORD", "PGPASSWORD"),
-        "sslmode": ("REFLEX_DB_SSLMODE", "PGSSLMODE"),
-        "options": ("REFLEX_DB_OPTIONS", "PGOPTIONS"),
-        "app_name": ("REFLEX_DB_APP_NAME", None),
-    }
-    envs = mapping.get(key, (None, None))
-    for var in envs:
+    """
+    Prefer REFLEX_DB_* then PG* for a given concept.
+    Cached per (key, default); call _prefer_env.cache_clear() after changing os.environ.
+    """
+    for var in _ENV_MAPPING.get(key, (None, None)):
         if var and var in os.environ:
             return os.environ[var]
     return default
@@ -174,16 +191,39 @@ def _find_helper_config() -> Tuple[Optional[Mapping[str, Any]], Optional[str]]:
 
     return None, None
 
+# Resolved (normalized_config, dsn_override); helpers/env don't change after startup
+_CFG_CACHE: Optional[Tuple[Dict[str, Any], Optional[str]]] = None
+_CFG_LOCK = threading.Lock()
+
 def _load_db_config() -> Tuple[Dict[str, Any], Optional[str]]:
     """
     Returns (normalized_config, dsn_override)
     normalized_config keys: host, port, dbname, user, password, sslmode?, options?
     dsn_override: a full DSN string from helpers, if provided.
+    Resolved once per process (failures are not cached); see reset_db_config_cache().
     """
+    global _CFG_CACHE
+    cached = _CFG_CACHE
+    if cached is not None:
+        return cached
+    with _CFG_LOCK:
+        if _CFG_CACHE is None:
+            _CFG_CACHE = _resolve_db_config()
+        return _CFG_CACHE
+
+def reset_db_config_cache() -> None:
+    """Forget resolved DB config, env lookups and built DSNs (tests / config reloads)."""
+    global _CFG_CACHE
+    with _CFG_LOCK:
+        _CFG_CACHE = None
+    _prefer_env.cache_clear()
+    _build_dsn_cached.cache_clear()
+
+def _resolve_db_config() -> Tuple[Dict[str, Any], Optional[str]]:
     helper_map, helper_dsn = _find_helper_config()
     if helper_map is None and helper_dsn is None:
-        # Environment fallback
-        helper_map = {
+        # Environment fallback (keys already lowercase)
+        low: Mapping[str, Any] = {
             "host": _prefer_env("host", "localhost"),
             "port": _prefer_env("port", "5432"),
             "dbname": _prefer_env("dbname", "TimeData"),
@@ -192,8 +232,8 @@ def _load_db_config() -> Tuple[Dict[str, Any], Optional[str]]:
             "sslmode": _prefer_env("sslmode", "prefer"),
             "options": _prefer_env("options", None),
         }
-
-    low = _lower_keys(helper_map or {})
+    else:
+        low = _lower_keys(helper_map or {})
     # normalize + aliases
     host = low.get("host") or low.get("hostname") or low.get("server")
     port = int(low.get("port", 5432) or 5432)
@@ -248,6 +288,10 @@ def build_dsn(
     provide a DSN, we use it and append application_name / connect_timeout if given.
     Otherwise, we build from normalized fields.
     """
+    return _build_dsn_cached(application_name, connect_timeout)
+
+@functools.lru_cache(maxsize=8)
+def _build_dsn_cached(application_name: Optional[str], connect_timeout: Optional[int]) -> str:
     cfg, helper_dsn = _load_db_config()
 
     if helper_dsn:
@@ -319,10 +363,35 @@ def init_pool(
     )
     logger.info("Initialized connection pool (min=%s, max=%s)", min_size, max_size)
 
+_POOL_LOCK = threading.Lock()
+
+def _ensure_default_pool() -> "ConnectionPool":
+    """Lazily open the process pool (min 1, max REFLEX_DB_POOL_MAX) on first use."""
+    pool = _POOL
+    if pool is None:
+        # double-checked: only the first caller builds it, the rest wait here
+        with _POOL_LOCK:
+            if _POOL is None:
+                init_pool(max_size=int(os.getenv("REFLEX_DB_POOL_MAX", "10")))
+            pool = _POOL
+    return pool
+
+def pool_max_size() -> Optional[int]:
+    """
+    Most connections connection() can hand out at once without a DSN: the open
+    pool's max_size, else the size the default pool will be opened with, or
+    None without psycopg_pool (direct connections, no cap).
+    """
+    pool = _POOL
+    if pool is not None:
+        return pool.max_size
+    return int(os.getenv("REFLEX_DB_POOL_MAX", "10")) if _HAVE_POOL else None
+
 def get_pool() -> "ConnectionPool":
-    if _POOL is None:
+    pool = _POOL
+    if pool is None:
         raise RuntimeError("Pool not initialized. Call init_pool() first.")
-    return _POOL
+    return pool
 
 @contextmanager
 def connection(
@@ -335,12 +404,16 @@ def connection(
     """
     Context manager yielding a psycopg connection.
 
-    - If a pool is initialized and no explicit DSN is passed, borrows from the pool.
+    - Without an explicit DSN, borrows from the pool (opened on first use when
+      psycopg_pool is installed).
     - Otherwise, opens a direct connection and closes it on exit.
     """
-    if _POOL is not None and dsn is None:
+    pool = _POOL if dsn is None else None  # one read of the global per call
+    if pool is None and dsn is None and _HAVE_POOL:
+        pool = _ensure_default_pool()
+    if pool is not None:
         # Pool-managed connection (closed/returned automatically)
-        with _POOL.connection() as conn:  # type: ignore
+        with pool.connection() as conn:
             conn.autocommit = autocommit
             yield conn
         return
@@ -395,15 +468,11 @@ def transaction(
         application_name=application_name,
         connect_timeout=connect_timeout,
     ) as conn:
-        try:
+        with conn.transaction():
             if statement_timeout_ms is not None:
                 with conn.cursor() as cur:
                     cur.execute("SET LOCAL statement_timeout = %s", (int(statement_timeout_ms),))
             yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
 
 # ---------------------- query helpers -----------------------------
 
@@ -414,17 +483,11 @@ def execute(
     dsn: Optional[str] = None,
     commit: bool = True,
 ) -> int:
-    """Execute non-SELECT; return rowcount or -1."""
+    """Execute non-SELECT; return rowcount or -1. commit=False rolls the statement back."""
     with connection(dsn=dsn, autocommit=False) as conn:
-        try:
-            with conn.cursor() as cur:
-                cur.execute(sql_text, params)
-                if commit:
-                    conn.commit()
-                return cur.rowcount if cur.rowcount is not None else -1
-        except Exception:
-            conn.rollback()
-            raise
+        with conn.transaction(force_rollback=not commit), conn.cursor() as cur:
+            cur.execute(sql_text, params)
+            return cur.rowcount if cur.rowcount is not None else -1
 
 def execute_many(
     sql_text: Union[str, sql.SQL],
@@ -435,15 +498,9 @@ def execute_many(
 ) -> int:
     total = 0
     with connection(dsn=dsn, autocommit=False) as conn:
-        try:
-            with conn.cursor() as cur:
-                cur.executemany(sql_text, seq_of_params)
-                total = cur.rowcount if cur.rowcount is not None else -1
-            if commit:
-                conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
+        with conn.transaction(force_rollback=not commit), conn.cursor() as cur:
+            cur.executemany(sql_text, seq_of_params)
+            total = cur.rowcount if cur.rowcount is not None else -1
     return total
 
 def query_one(
@@ -465,15 +522,44 @@ def query_all(
     *,
     dsn: Optional[str] = None,
     as_dict: bool = True,
+    binary: bool = False,
 ) -> List[Union[Mapping[str, Any], Tuple[Any, ...]]]:
     with connection(dsn=dsn, autocommit=True) as conn:
         rf = dict_row if as_dict else None
-        with conn.cursor(row_factory=rf) as cur:
+        with conn.cursor(row_factory=rf, binary=binary) as cur:
             cur.execute(sql_text, params)
             return cur.fetchall()
 
+def query_iter(
+    sql_text: Union[str, sql.SQL],
+    params: Params = None,
+    *,
+    dsn: Optional[str] = None,
+    as_dict: bool = True,
+    itersize: int = 1000,
+    binary: bool = False,
+) -> Iterator[Union[Mapping[str, Any], Tuple[Any, ...]]]:
+    """
+    Stream a SELECT through a server-side cursor, `itersize` rows per fetch.
+    The connection is held until the generator is exhausted or closed.
+    binary=True fetches results in binary format (no text parsing of numbers/
+    timestamps); types without a binary loader then come back as bytes.
+    """
+    with connection(dsn=dsn, autocommit=False) as conn:
+        rf = dict_row if as_dict else None
+        try:
+            with conn.cursor(name=f"reflex_{uuid.uuid4().hex}", row_factory=rf, binary=binary) as cur:
+                cur.itersize = itersize
+                cur.execute(sql_text, params)
+                yield from cur
+        finally:
+            conn.rollback()  # read-only: just end the transaction that held the portal
+
 # ---------------------- bulk helpers ------------------------------
 
+# Postgres caps bind parameters per statement at 65535 (Int16 count in Bind)
+MAX_BIND_PARAMS = 65535
+
 def _ident_qualified(name: str) -> sql.Composable:
     parts = [p.strip() for p in name.split(".") if p.strip()]
     if not parts:
@@ -485,29 +571,232 @@ def _ident_qualified(name: str) -> sql.Composable:
 
 def _ensure_rows_and_columns(
     rows_or_columns: Union[Iterable[Mapping[str, Any]], Sequence[str]],
-    maybe_rows: Optional[Iterable[Mapping[str, Any]]] = None,
-) -> Tuple[List[str], List[Mapping[str, Any]]]:
+    maybe_rows: Optional[Iterable[Union[Mapping[str, Any], Sequence[Any]]]] = None,
+) -> Tuple[List[str], Iterable[Union[Mapping[str, Any], Sequence[Any]]]]:
+    """
+    Resolve (columns, rows). With explicit columns, rows may be mappings or
+    positional tuples already in column order; otherwise columns come from the
+    first mapping. Only the first row is validated. Lists/tuples are returned
+    as-is; any other iterable is streamed, its rows projected to positional
+    tuples lazily, so nothing is materialized.
+    """
+    columns: Optional[List[str]] = None
+    src: Any = rows_or_columns
     if isinstance(rows_or_columns, (list, tuple)) and rows_or_columns and isinstance(rows_or_columns[0], str):
         if maybe_rows is None:
             raise ValueError("rows must be provided when columns are specified explicitly.")
-        columns: List[str] = list(rows_or_columns)  # type: ignore
-        rows: List[Mapping[str, Any]] = list(maybe_rows)
+        columns = list(rows_or_columns)  # type: ignore
+        src = maybe_rows
+
+    if isinstance(src, (list, tuple)):
+        rows: Sequence[Any] = src
         if not rows:
+            if columns is None:
+                raise ValueError("rows collection is empty.")
             return columns, []
+        first = rows[0]
     else:
-        rows = list(rows_or_columns)  # type: ignore
-        if not rows:
-            raise ValueError("rows collection is empty.")
-        if not isinstance(rows[0], Mapping):
+        it = iter(src)
+        first = next(it, None)
+        if first is None:
+            if columns is None:
+                raise ValueError("rows collection is empty.")
+            return columns, []
+        rows = None  # type: ignore  # streamed
+
+    if columns is None:
+        if not isinstance(first, Mapping):
             raise TypeError("rows must be mapping objects.")
-        columns = list(rows[0].keys())
-    # Validate completeness
-    for i, r in enumerate(rows):
-        missing = [c for c in columns if c not in r]
-        if missing:
-            raise ValueError(f"Row {i} missing columns: {missing}")
+        columns = list(first.keys())
+
+    if not isinstance(first, Mapping):
+        if len(first) != len(columns):
+            raise ValueError(f"Row width {len(first)} does not match {len(columns)} columns.")
+        return columns, (rows if rows is not None else chain((first,), it))
+
+    # Only the first row is checked up front; a later row missing a column
+    # surfaces as ValueError from _project when it is reached.
+    missing = [c for c in columns if c not in first]
+    if missing:
+        raise ValueError(f"Row 0 missing columns: {missing}")
+    if rows is None:
+        return columns, _project(columns)(chain((first,), it))
     return columns, rows
 
+def _project(columns: Sequence[str]):
+    """Callable mapping an iterable of mappings to value tuples in column order."""
+    if len(columns) == 1:
+        c = columns[0]
+        getter = lambda r: (r[c],)
+    else:
+        getter = itemgetter(*columns)  # projects each mapping to a tuple in C
+
+    def project(rows: Iterable[Mapping[str, Any]]) -> Iterator[Tuple[Any, ...]]:
+        i = -1
+        try:
+            for i, values in enumerate(map(getter, rows)):
+                yield values
+        except KeyError as e:
+            raise ValueError(f"Row {i + 1} missing column: {e}") from None
+    return project
+
+def _row_tuples(columns: Sequence[str], rows: Iterable[Any]) -> Iterable[Sequence[Any]]:
+    """Value tuples in column order: positional rows pass through, mappings are projected."""
+    if not isinstance(rows, (list, tuple)):
+        return rows  # streamed rows are already positional (see _ensure_rows_and_columns)
+    if rows and not isinstance(rows[0], Mapping):
+        return rows
+    return _project(columns)(rows)
+
+def _batched(it: Iterable[Any], n: int) -> Iterator[List[Any]]:
+    """Yield lists of up to n items from it."""
+    it = iter(it)
+    while True:
+        batch = list(islice(it, n))
+        if not batch:
+            return
+        yield batch
+
+def _conflict_set_sql(update_cols: Sequence[str], coalesce_cols: Sequence[str], target: sql.Composable) -> sql.Composable:
+    """SET list for ON CONFLICT DO UPDATE; coalesce_cols keep the stored value when the new one is NULL."""
+    keep = set(coalesce_cols)
+    exprs = []
+    for c in update_cols:
+        ident = sql.Identifier(c)
+        if c in keep:
+            exprs.append(sql.SQL("{} = COALESCE(EXCLUDED.{}, {}.{})").format(ident, ident, target, ident))
+        else:
+            exprs.append(sql.SQL("{} = EXCLUDED.{}").format(ident, ident))
+    return sql.SQL(", ").join(exprs)
+
+def _column_oids(cur: psycopg.Cursor, rel: sql.Composable, columns: Sequence[str]) -> List[int]:
+    """Type OIDs of `columns` on relation `rel` (binary COPY dumps by these)."""
+    cur.execute(
+        "SELECT attname, atttypid FROM pg_attribute "
+        "WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped",
+        (rel.as_string(cur.connection),),
+        prepare=True,  # runs before every COPY: keep the plan on the connection
+    )
+    oids = dict(cur.fetchall())
+    return [oids[c] for c in columns]
+
+_INT_OIDS = frozenset((20, 21, 23))  # int8, int2, int4
+
+def _to_int(v: Any) -> Any:
+    # what the INSERT path gets from the server's assignment casts
+    if isinstance(v, float):
+        return round(v)  # half-even, like float8 -> int
+    if isinstance(v, Decimal):
+        return int(v.to_integral_value(ROUND_HALF_UP))  # numeric -> int rounds half away from zero
+    return v
+
+def _write_copy_rows(cp: Any, types: List[int], rows: Iterable[Sequence[Any]], binary: bool) -> None:
+    """
+    Stream rows into an open COPY. binary=True dumps by column OID and needs
+    exact Python types (no float into BIGINT, no naive datetime into
+    TIMESTAMPTZ). Text COPY lets the server parse each value as the INSERT path
+    would; only floats/Decimals bound for integer columns are rounded first,
+    because the text input of an int column rejects "5.0".
+    """
+    write_row = cp.write_row
+    if binary:
+        cp.set_types(types)
+        for values in rows:
+            write_row(values)
+        return
+    int_idx = [i for i, t in enumerate(types) if t in _INT_OIDS]
+    if not int_idx:
+        for values in rows:
+            write_row(values)
+        return
+    for values in rows:
+        if any(type(values[i]) not in (int, type(None)) for i in int_idx):
+            values = list(values)
+            for i in int_idx:
+                values[i] = _to_int(values[i])
+        write_row(values)
+
+def _copy_sql(rel: sql.Composable, cols_sql: sql.Composable, binary: bool) -> sql.Composed:
+    fmt = " WITH (FORMAT BINARY)" if binary else ""
+    return sql.SQL("COPY {} ({}) FROM STDIN" + fmt).format(rel, cols_sql)
+
+def _placeholder(binary: bool) -> sql.Placeholder:
+    # %b: values go over the wire in binary (no str()/re-parse per value), but a
+    # str is then typed as text and dicts/Decimal-as-str no longer adapt, so it
+    # is opt-in; the default %s lets psycopg/the server pick the type.
+    return sql.Placeholder(format=PyFormat.BINARY if binary else PyFormat.AUTO)
+
+# Statement builders are cached: repeated calls for the same table/column shape
+# reuse the Composed trees instead of re-running sql.SQL.format.
+@functools.lru_cache(maxsize=256)
+def _insert_sql(
+    table: str, columns: Tuple[str, ...], binary: bool = False,
+) -> Tuple[sql.Composable, sql.Composed, sql.Composed]:
+    """(table ident, COPY statement, single-row INSERT) for bulk_insert."""
+    table_ident = _ident_qualified(table)
+    cols_sql = sql.SQL(", ").join(sql.Identifier(c) for c in columns)
+    copy_stmt = _copy_sql(table_ident, cols_sql, binary)
+    placeholders = sql.SQL(", ").join([_placeholder(binary)] * len(columns))
+    insert = sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(table_ident, cols_sql, placeholders)
+    return table_ident, copy_stmt, insert
+
+def _conflict_action(update_cols: Sequence[str], coalesce_cols: Sequence[str], target: sql.Composable) -> sql.Composable:
+    if not update_cols:
+        return sql.SQL("DO NOTHING")
+    return sql.SQL("DO UPDATE SET {}").format(_conflict_set_sql(update_cols, coalesce_cols, target))
+
+@functools.lru_cache(maxsize=64)
+def _upsert_sql_parts(
+    table: str, columns: Tuple[str, ...], conflict_cols: Tuple[str, ...],
+    update_cols: Tuple[str, ...], coalesce_cols: Tuple[str, ...], binary: bool = False,
+) -> Tuple[sql.Composed, sql.Composed, sql.Composed]:
+    """(INSERT head, one VALUES row, ON CONFLICT tail) for bulk_upsert pages."""
+    target = sql.Identifier("_tgt")
+    head = sql.SQL("INSERT INTO {} AS {} ({}) VALUES ").format(
+        _ident_qualified(table), target, sql.SQL(", ").join(sql.Identifier(c) for c in columns)
+    )
+    row_sql = sql.SQL("({})").format(sql.SQL(", ").join([_placeholder(binary)] * len(columns)))
+    tail = sql.SQL(" ON CONFLICT ({}) {}").format(
+        sql.SQL(", ").join(sql.Identifier(c) for c in conflict_cols),
+        _conflict_action(update_cols, coalesce_cols, target),
+    )
+    return head, row_sql, tail
+
+@functools.lru_cache(maxsize=256)
+def _upsert_page_sql(
+    table: str, columns: Tuple[str, ...], conflict_cols: Tuple[str, ...],
+    update_cols: Tuple[str, ...], coalesce_cols: Tuple[str, ...], binary: bool, n: int,
+) -> sql.Composed:
+    """Multi-row INSERT ... VALUES (...), ... ON CONFLICT for a page of n rows."""
+    head, row_sql, tail = _upsert_sql_parts(table, columns, conflict_cols, update_cols, coalesce_cols, binary)
+    return head + sql.SQL(", ").join([row_sql] * n) + tail
+
+@functools.lru_cache(maxsize=64)
+def _copy_upsert_sql(
+    table: str, columns: Tuple[str, ...], conflict_cols: Tuple[str, ...],
+    update_cols: Tuple[str, ...], coalesce_cols: Tuple[str, ...], binary: bool = False,
+) -> Tuple[sql.Identifier, sql.Composed, sql.Composed, sql.Composed]:
+    """(stage ident, CREATE stage, COPY into stage, merge) for copy_upsert."""
+    table_ident = _ident_qualified(table)
+    stage_ident = sql.Identifier("_stage_" + table.replace(".", "_"))
+    cols_sql = sql.SQL(", ").join(sql.Identifier(c) for c in columns)
+    conflict_sql = sql.SQL(", ").join(sql.Identifier(c) for c in conflict_cols)
+
+    create_stage = sql.SQL(
+        "CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA"
+    ).format(stage_ident, cols_sql, table_ident)
+    copy_stmt = _copy_sql(stage_ident, cols_sql, binary)
+    target = sql.Identifier("_tgt")
+    # DISTINCT ON keeps one row per key (latest by ctid, i.e. COPY order) so
+    # ON CONFLICT never touches the same target row twice in one statement.
+    merge = sql.SQL(
+        "INSERT INTO {} AS {} ({}) SELECT DISTINCT ON ({}) {} FROM {} ORDER BY {}, ctid DESC ON CONFLICT ({}) {}"
+    ).format(
+        table_ident, target, cols_sql, conflict_sql, cols_sql, stage_ident, conflict_sql, conflict_sql,
+        _conflict_action(update_cols, coalesce_cols, target),
+    )
+    return stage_ident, create_stage, copy_stmt, merge
+
 def bulk_insert(
     table: str,
     rows_or_columns: Union[Iterable[Mapping[str, Any]], Sequence[str]],
@@ -516,34 +805,39 @@ def bulk_insert(
     dsn: Optional[str] = None,
     chunk_size: int = 1000,
     commit: bool = True,
+    use_copy: bool = False,
+    binary: bool = False,
 ) -> int:
+    """
+    Plain INSERT of many rows: chunked executemany in one pipeline; executemany
+    prepares the INSERT server-side from the first row. use_copy=True streams
+    the rows with one COPY instead (not for views/rules, which COPY does not
+    support). binary=True sends values in binary (%b parameters / binary COPY),
+    only for callers whose value types match the columns exactly; otherwise
+    values load as text and the server casts them.
+    """
     columns, row_dicts = _ensure_rows_and_columns(rows_or_columns, rows)
     if not row_dicts:
         return 0
-    table_ident = _ident_qualified(table)
-    col_idents = [sql.Identifier(c) for c in columns]
-    placeholders = sql.SQL(", ").join([sql.Placeholder()] * len(columns))
-    stmt = sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(table_ident, sql.SQL(", ").join(col_idents), placeholders)
+    table_ident, copy_stmt, stmt = _insert_sql(table, tuple(columns), binary)
 
     total = 0
     with connection(dsn=dsn, autocommit=False) as conn:
-        try:
-            with conn.cursor() as cur:
-                batch: List[Sequence[Any]] = []
-                for r in row_dicts:
-                    batch.append(tuple(r[c] for c in columns))
-                    if len(batch) >= chunk_size:
-                        cur.executemany(stmt, batch)
-                        total += cur.rowcount if cur.rowcount is not None else len(batch)
-                        batch.clear()
-                if batch:
-                    cur.executemany(stmt, batch)
-                    total += cur.rowcount if cur.rowcount is not None else len(batch)
-            if commit:
-                conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
+        with conn.transaction(force_rollback=not commit), conn.cursor() as cur:
+            if use_copy:
+                types = _column_oids(cur, table_ident, columns)
+                with cur.copy(copy_stmt) as cp:
+                    _write_copy_rows(cp, types, _row_tuples(columns, row_dicts), binary)
+                total = cur.rowcount if cur.rowcount is not None else -1
+            else:
+                # one pipeline across chunks: no sync round-trip between them.
+                # returning=False: no per-row results are kept. cur.rowcount is
+                # not reliable across chunks in a pipeline (it resets per
+                # executemany while results arrive later), so count rows sent.
+                with conn.pipeline():
+                    for batch in _batched(_row_tuples(columns, row_dicts), chunk_size):
+                        cur.executemany(stmt, batch, returning=False)
+                        total += len(batch)
     return total
 
 def bulk_upsert(
@@ -553,10 +847,17 @@ def bulk_upsert(
     *,
     conflict_cols: Sequence[str],
     update_cols: Optional[Sequence[str]] = None,
+    coalesce_cols: Sequence[str] = (),
     dsn: Optional[str] = None,
-    chunk_size: int = 1000,
+    chunk_size: Optional[int] = 1000,
     commit: bool = True,
+    binary: bool = False,
 ) -> int:
+    """
+    Multi-row INSERT ... ON CONFLICT in pages of chunk_size rows (None: as many
+    as the bind-parameter limit allows). binary=True sends parameters as %b
+    (only for callers whose value types match the columns exactly).
+    """
     if not conflict_cols:
         raise ValueError("conflict_cols must be provided.")
     columns, row_dicts = _ensure_rows_and_columns(rows_or_columns, rows)
@@ -564,51 +865,96 @@ def bulk_upsert(
         return 0
     if update_cols is None:
         update_cols = [c for c in columns if c not in conflict_cols]
-    do_nothing = len(update_cols) == 0
+    stmt_for = functools.partial(
+        _upsert_page_sql, table, tuple(columns), tuple(conflict_cols), tuple(update_cols), tuple(coalesce_cols), binary
+    )
 
-    table_ident = _ident_qualified(table)
-    col_idents = [sql.Identifier(c) for c in columns]
-    conflict_idents = [sql.Identifier(c) for c in conflict_cols]
-    placeholders = sql.SQL(", ").join([sql.Placeholder()] * len(columns))
-
-    if do_nothing:
-        stmt = sql.SQL(
-            "INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ({}) DO NOTHING"
-        ).format(table_ident, sql.SQL(", ").join(col_idents), placeholders, sql.SQL(", ").join(conflict_idents))
-    else:
-        set_exprs = [
-            sql.SQL("{} = EXCLUDED.{}").format(sql.Identifier(c), sql.Identifier(c)) for c in (update_cols or [])
-        ]
-        stmt = sql.SQL(
-            "INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ({}) DO UPDATE SET {}"
-        ).format(
-            table_ident, sql.SQL(", ").join(col_idents), placeholders,
-            sql.SQL(", ").join(conflict_idents), sql.SQL(", ").join(set_exprs)
-        )
+    # ON CONFLICT may not touch a target row twice in one statement: keep the
+    # last row per conflict key within each page (later pages overwrite anyway).
+    # Pages are then sent in key order so inserts walk the index (and, for
+    # hypertables, the time chunk) sequentially instead of at random.
+    key_of = itemgetter(*[columns.index(c) for c in conflict_cols])
+    # chunk_size=None: as many rows per page as the bind-parameter limit allows
+    max_rows = MAX_BIND_PARAMS // len(columns)
+    page_rows = max(1, max_rows if chunk_size is None else min(chunk_size, max_rows))
 
     total = 0
     with connection(dsn=dsn, autocommit=False) as conn:
-        try:
-            with conn.cursor() as cur:
-                batch: List[Sequence[Any]] = []
-                for r in row_dicts:
-                    batch.append(tuple(r[c] for c in columns))
-                    if len(batch) >= chunk_size:
-                        cur.executemany(stmt, batch)
-                        total += cur.rowcount if cur.rowcount is not None else len(batch)
-                        batch.clear()
-                if batch:
-                    cur.executemany(stmt, batch)
-                    total += cur.rowcount if cur.rowcount is not None else len(batch)
-            if commit:
-                conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
+        # Pipeline mode: pages are sent back-to-back without waiting for
+        # each server response; results are collected at the final sync.
+        with conn.transaction(force_rollback=not commit), conn.pipeline(), conn.cursor() as cur:
+            execute = cur.execute
+            flatten = chain.from_iterable
+            for page in _batched(_row_tuples(columns, row_dicts), page_rows):
+                page = list(dict(zip(map(key_of, page), page)).values())
+                try:
+                    page.sort(key=key_of)
+                except TypeError:
+                    pass  # keys not mutually comparable (e.g. NULLs); send as-is
+                # prepare=True: every full page reuses one server-side plan
+                execute(stmt_for(len(page)), list(flatten(page)), prepare=True)
+                total += len(page)
+    return total
+
+def copy_upsert(
+    table: str,
+    rows_or_columns: Union[Iterable[Mapping[str, Any]], Sequence[str]],
+    rows: Optional[Iterable[Mapping[str, Any]]] = None,
+    *,
+    conflict_cols: Sequence[str],
+    update_cols: Optional[Sequence[str]] = None,
+    coalesce_cols: Sequence[str] = (),
+    dsn: Optional[str] = None,
+    commit: bool = True,
+    binary: bool = False,
+) -> int:
+    """
+    bulk_upsert for large batches: streams rows with COPY into a
+    transaction-scoped staging table, then merges them with a single
+    INSERT ... SELECT ... ON CONFLICT. No per-row SQL parse/bind on the server.
+    Duplicate conflict keys in the input resolve to the last row (as with bulk_upsert).
+    Text COPY by default, so values load as they would through bulk_upsert;
+    binary=True only for callers whose Python types match the columns exactly.
+    """
+    if not conflict_cols:
+        raise ValueError("conflict_cols must be provided.")
+    columns, row_dicts = _ensure_rows_and_columns(rows_or_columns, rows)
+    if not row_dicts:
+        return 0
+    if update_cols is None:
+        update_cols = [c for c in columns if c not in conflict_cols]
+
+    stage_ident, create_stage, copy_stmt, merge = _copy_upsert_sql(
+        table, tuple(columns), tuple(conflict_cols), tuple(update_cols), tuple(coalesce_cols), binary
+    )
+
+    with connection(dsn=dsn, autocommit=False) as conn:
+        with conn.transaction(force_rollback=not commit), conn.cursor() as cur:
+            cur.execute(create_stage)
+            types = _column_oids(cur, stage_ident, columns)
+            with cur.copy(copy_stmt) as cp:
+                _write_copy_rows(cp, types, _row_tuples(columns, row_dicts), binary)
+            cur.execute(merge)
+            total = cur.rowcount if cur.rowcount is not None else -1
     return total
 
 # ---------------------- SQL scripts --------------------------------
 
+# One token per match: plain text, comments, quoted strings, dollar-quoted bodies,
+# ';', or a lone char. Unterminated quotes/comments/bodies run to end of text.
+_SQL_TOKEN = re.compile(
+    r"""
+      [^-/'";$]+
+    | --[^\n]*\n?
+    | /\*.*?(?:\*/|\Z)
+    | '[^']*(?:''[^']*)*(?:'|\Z)
+    | "[^"]*(?:""[^"]*)*(?:"|\Z)
+    | \$(\w*)\$.*?(?:\$\1\$|\Z)
+    | .
+    """,
+    re.S | re.X,
+)
+
 def _split_sql_statements(sql_text: str) -> List[str]:
     """
     Split SQL text into statements by semicolons, respecting:
@@ -617,95 +963,17 @@ def _split_sql_statements(sql_text: str) -> List[str]:
     - line comments (--) and block comments (/*...*/)
     """
     stmts: List[str] = []
-    buf: List[str] = []
-
-    in_squote = False
-    in_dquote = False
-    in_line_comment = False
-    in_block_comment = False
-    dollar_tag: Optional[str] = None
-
-    i = 0
-    n = len(sql_text)
-
-    def at(idx: int) -> str:
-        return sql_text[idx] if 0 <= idx < n else ""
-
-    while i < n:
-        ch = sql_text[i]
-        nxt = at(i + 1)
-
-        # finish line comment
-        if in_line_comment:
-            buf.append(ch)
-            if ch == "\n":
-                in_line_comment = False
-            i += 1
-            continue
-
-        # finish block comment
-        if in_block_comment:
-            buf.append(ch)
-            if ch == "*" and nxt == "/":
-                buf.append(nxt)
-                i += 2
-                in_block_comment = False
-            else:
-                i += 1
-            continue
-
-        # start comments when not inside quotes/dollar
-        if not in_squote and not in_dquote and dollar_tag is None:
-            if ch == "-" and nxt == "-":
-                buf.append(ch); buf.append(nxt); i += 2; in_line_comment = True; continue
-            if ch == "/" and nxt == "*":
-                buf.append(ch); buf.append(nxt); i += 2; in_block_comment = True; continue
-
-        # dollar-quoted block start?
-        if not in_squote and not in_dquote and ch == "$":
-            j = i + 1
-            while j < n and sql_text[j] != "$" and (sql_text[j].isalnum() or sql_text[j] == "_"):
-                j += 1
-            if j < n and sql_text[j] == "$":
-                dollar_tag = sql_text[i + 1 : j]  # may be ""
-                buf.append(sql_text[i : j + 1])
-                i = j + 1
-                continue
-
-        # dollar-quoted block end?
-        if dollar_tag is not None:
-            if ch == "$":
-                j = i + 1
-                k = j
-                while k < n and sql_text[k] != "$" and (sql_text[k].isalnum() or sql_text[k] == "_"):
-                    k += 1
-                if k < n and sql_text[k] == "$":
-                    tag = sql_text[j:k]
-                    if tag == dollar_tag:
-                        buf.append(sql_text[i : k + 1])
-                        i = k + 1
-                        dollar_tag = None
-                        continue
-            buf.append(ch); i += 1; continue
-
-        # quotes
-        if ch == "'" and not in_dquote:
-            in_squote = not in_squote; buf.append(ch); i += 1; continue
-        if ch == '"' and not in_squote:
-            in_dquote = not in_dquote; buf.append(ch); i += 1; continue
-
-        # statement boundary
-        if ch == ";" and not in_squote and not in_dquote and dollar_tag is None:
-            stmt = "".join(buf).strip()
+    append = stmts.append
+    stmt_start = 0
+    # Only ';' tokens matter; statements are sliced straight out of sql_text
+    for m in _SQL_TOKEN.finditer(sql_text):
+        if m.group() == ";":
+            i = m.start()
+            stmt = sql_text[stmt_start:i].strip()
             if stmt:
-                stmts.append(stmt)
-            buf.clear()
-            i += 1
-            continue
-
-        buf.append(ch); i += 1
-
-    tail = "".join(buf).strip()
+                append(stmt)
+            stmt_start = i + 1
+    tail = sql_text[stmt_start:].strip()
     if tail:
         stmts.append(tail)
     return stmts
@@ -735,18 +1003,14 @@ def execute_sql_commands(
     conn_autocommit = True if not stop_on_error else autocommit
     with connection(dsn=dsn, autocommit=conn_autocommit) as conn:
         if stop_on_error:
-            try:
-                with conn.cursor() as cur:
-                    for s in stmts:
-                        if not s:
-                            continue
-                        if echo:
-                            logger.info("[SQL] %s", s)
-                        cur.execute(s)
-                conn.commit()
-            except Exception:
-                conn.rollback()
-                raise
+            # autocommit=True keeps per-statement commits (e.g. CREATE INDEX CONCURRENTLY)
+            with (nullcontext() if conn_autocommit else conn.transaction()), conn.cursor() as cur:
+                for s in stmts:
+                    if not s:
+                        continue
+                    if echo:
+                        logger.info("[SQL] %s", s)
+                    cur.execute(s)
         else:
             with conn.cursor() as cur:
                 for s in stmts:
@@ -803,7 +1067,7 @@ def exec_sql_query(conn: psycopg.Connection, sql_text: str, logger_: Optional[lo
             rows = cur.fetchall()
             if logger_:
                 logger_.info("[📥] Retrieved %d rows.", len(rows))
-            return [dict(row) for row in rows]
+            return rows  # dict_row already builds plain dicts
     except Exception as e:
         if logger_:
             logger_.error("[❌] Query failed: %s", e)
@@ -834,15 +1098,16 @@ def execute_sql_list_on_connection(sql_list: List[str], conn: psycopg.Connection
 __all__ = [
     # Core config
     "build_dsn",
+    "reset_db_config_cache",
 
     # Connection / pool
     "get_connection", "connection", "transaction", "init_pool", "get_pool",
 
     # Query helpers
-    "execute", "execute_many", "query_one", "query_all",
+    "execute", "execute_many", "query_one", "query_all", "query_iter",
 
     # Bulk helpers
-    "bulk_insert", "bulk_upsert",
+    "bulk_insert", "bulk_upsert", "copy_upsert",
 
     # SQL scripts
     "execute_sql_commands", "execute_sql_file",
@@ -1,14 +1,33 @@
 # common/fundamentals.py
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from operator import itemgetter
 from typing import List, Dict, Any
-from .dbutils import bulk_upsert
+from .dbutils import bulk_upsert, copy_upsert
 from .schema import T_FUNDS, Fundamentals
 from .common import ExternalApiError
 try:
     from polygon_api import rest as poly_rest
 except Exception:
     poly_rest = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# (row field, Polygon field) for the float columns
+_FLOAT_FIELDS = (
+    ("shares_out", "shares_outstanding"),
+    ("float_shares", "float"),
+    ("pe", "pe_ratio"),
+    ("market_cap", "market_cap"),
+)
+# below this many symbols the per-value path is cheaper than building arrays
+_VECTORIZE_MIN = 1000
+# universe-wide refreshes go through binary COPY + merge instead of INSERT pages
+COPY_MIN_ROWS = 1024
 
 def _norm_float(v) -> float | None:
     try:
@@ -20,20 +39,43 @@ def _norm_float(v) -> float | None:
     except Exception:
         return None
 
-def fetch_and_store_fundamentals(symbols: List[str], asof_utc: datetime, api_key: str, rest_base: str) -> int:
-    """Fetch fundamentals via polygon_api.rest and upsert into DB."""
+def _norm_float_column(values: List[Any]) -> List[float | None]:
+    """_norm_float over a whole column: one float64 array, NaN/None -> None."""
+    if np is not None and len(values) >= _VECTORIZE_MIN:
+        try:
+            arr = np.array(values, dtype=np.float64)  # None -> NaN
+            return np.where(np.isnan(arr), None, arr).tolist()
+        except (TypeError, ValueError, OverflowError):
+            pass  # a non-numeric or out-of-range value somewhere: fall back to per-value
+    return [_norm_float(v) for v in values]
+
+def fetch_and_store_fundamentals(
+    symbols: List[str], asof_utc: datetime, api_key: str, rest_base: str, max_workers: int = 16,
+) -> int:
+    """Fetch fundamentals via polygon_api.rest (max_workers requests in flight) and upsert into DB."""
     if not poly_rest:
         raise ExternalApiError("polygon_api.rest not available.")
-    rows: list[dict[str, Any]] = []
-    for sym in symbols:
-        f = poly_rest.get_fundamentals(api_key=api_key, base_url=rest_base, symbol=sym)
-        rows.append(dict(
-            symbol=sym,
-            ts_utc=asof_utc,
-            shares_out=_norm_float(f.get("shares_outstanding")),
-            float_shares=_norm_float(f.get("float")),
-            pe=_norm_float(f.get("pe_ratio")),
-            market_cap=_norm_float(f.get("market_cap")),
-        ))
-    return bulk_upsert(T_FUNDS, rows, conflict_cols=["symbol","ts_utc"],
-                       update_cols=["shares_out","float_shares","pe","market_cap"])
+
+    def _one(sym: str) -> Dict[str, Any]:
+        return poly_rest.get_fundamentals(api_key=api_key, base_url=rest_base, symbol=sym)
+
+    if not symbols:
+        return 0
+    # I/O bound: threads overlap the HTTP round-trips; map() keeps symbol order
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as ex:
+        raw = list(ex.map(_one, symbols))
+
+    names = tuple(name for name, _ in _FLOAT_FIELDS)
+    cols = [_norm_float_column([f.get(src) for f in raw]) for _, src in _FLOAT_FIELDS]
+    # sized once up front; rows are filled in symbol order from the column lists
+    rows: list[dict[str, Any]] = [None] * len(symbols)  # type: ignore[list-item]
+    for i, (sym, *vals) in enumerate(zip(symbols, *cols)):
+        row = {"symbol": sym, "ts_utc": asof_utc}
+        row.update(zip(names, vals))
+        rows[i] = row
+    # time-then-symbol order keeps hypertable writes in the newest chunk
+    rows.sort(key=itemgetter("ts_utc", "symbol"))
+    # values are str/datetime/float|None we built above: safe to bind as %b
+    write = copy_upsert if len(rows) >= COPY_MIN_ROWS else partial(bulk_upsert, binary=True)
+    return write(T_FUNDS, rows, conflict_cols=["symbol","ts_utc"],
+                 update_cols=["shares_out","float_shares","pe","market_cap"])
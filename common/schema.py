@@ -4,6 +4,11 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
 # Canonical table names
 T_TICKS = "ticks"
 T_QUOTES = "quotes"
@@ -12,17 +17,29 @@ T_DAILY = "daily_bars"
 T_SYMBOLS = "symbols"
 T_FUNDS = "fundamentals"
 
-# Records (Python-side)
-@dataclass(slots=True)
-class Tick:
+# Records (Python-side). With msgspec installed they are array_like Structs:
+# faster to construct, and msgspec.json.Decoder(list[Tick]) decodes JSON arrays
+# straight into them. Otherwise slotted dataclasses with the same fields.
+if msgspec is not None:
+    class _Record(msgspec.Struct, array_like=True):
+        pass
+
+    def _record(cls):
+        return cls
+else:
+    _Record = object
+    _record = dataclass(slots=True)
+
+@_record
+class Tick(_Record):
     symbol: str
     ts_utc: datetime
     price: float
     size: int
     exchange: Optional[int] = None
 
-@dataclass(slots=True)
-class Quote:
+@_record
+class Quote(_Record):
     symbol: str
     ts_utc: datetime
     bid: float
@@ -31,8 +48,8 @@ class Quote:
     ask_size: int
     exchange: Optional[int] = None
 
-@dataclass(slots=True)
-class MinuteBar:
+@_record
+class MinuteBar(_Record):
     symbol: str
     ts_utc: datetime  # start of minute
     open: float
@@ -43,8 +60,8 @@ class MinuteBar:
     vwap: Optional[float] = None
     trades: Optional[int] = None
 
-@dataclass(slots=True)
-class DailyBar:
+@_record
+class DailyBar(_Record):
     symbol: str
     session_date: datetime  # date at 00:00 UTC
     open: float
@@ -53,8 +70,8 @@ class DailyBar:
     close: float
     volume: int
 
-@dataclass(slots=True)
-class Fundamentals:
+@_record
+class Fundamentals(_Record):
     symbol: str
     ts_utc: datetime
     shares_out: Optional[float] = None
@@ -145,3 +162,33 @@ CREATE INDEX IF NOT EXISTS idx_{T_MINUTE}_symbol_ts ON {T_MINUTE}(symbol, ts_utc
 CREATE INDEX IF NOT EXISTS idx_{T_DAILY}_symbol_dt ON {T_DAILY}(symbol, session_date DESC);
 CREATE INDEX IF NOT EXISTS idx_{T_FUNDS}_symbol_ts ON {T_FUNDS}(symbol, ts_utc DESC);
 """
+
+# Bump when the DDL above changes; ensure_schema() skips versions already applied
+SCHEMA_VERSION = 1
+
+SCHEMA_VERSION_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version(
+  version INTEGER PRIMARY KEY,
+  applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+"""
+
+def ensure_schema(*, dsn: Optional[str] = None, force: bool = False) -> bool:
+    """
+    Apply extension, tables, hypertables and indexes in one transaction and one
+    round-trip. Returns False without touching the DDL when SCHEMA_VERSION is
+    already recorded (unless force=True).
+    """
+    from .dbutils import connection
+    with connection(dsn=dsn, autocommit=False) as conn, conn.transaction():
+        conn.execute(SCHEMA_VERSION_SQL)
+        if not force and conn.execute(
+            "SELECT 1 FROM schema_version WHERE version = %s", (SCHEMA_VERSION,)
+        ).fetchone():
+            return False
+        # no parameters: the whole script goes as one simple-protocol query
+        conn.execute(CREATE_EXTENSION_SQL + CREATE_TABLES_SQL + CREATE_HYPERTABLES_SQL + INDEXES_SQL)
+        conn.execute(
+            "INSERT INTO schema_version(version) VALUES (%s) ON CONFLICT DO NOTHING", (SCHEMA_VERSION,)
+        )
+    return True
@@ -1,6 +1,7 @@
 # common/timeutils.py
 from __future__ import annotations
-from datetime import datetime, time, timedelta, timezone
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
 from typing import Tuple
 
 try:
@@ -27,20 +28,24 @@ def to_et(dt: datetime) -> datetime:
         return dt.astimezone(_ET)
     return dt.replace(tzinfo=UTC).astimezone(_ET)
 
-def market_session_bounds_et(dt: datetime) -> Tuple[datetime, datetime]:
-    d_et = to_et(dt).date()
+@lru_cache(maxsize=32)
+def _bounds_for_et_date(d_et: date) -> Tuple[datetime, datetime]:
+    # per-tick callers almost always ask about the same few ET dates
     start = datetime.combine(d_et, MARKET_OPEN_ET, tzinfo=_ET)
     end = datetime.combine(d_et, MARKET_CLOSE_ET, tzinfo=_ET)
     return start, end
 
+def market_session_bounds_et(dt: datetime) -> Tuple[datetime, datetime]:
+    return _bounds_for_et_date(to_et(dt).date())
+
 def is_market_open(dt: datetime) -> bool:
-    s, e = market_session_bounds_et(dt)
     d = to_et(dt)
+    s, e = _bounds_for_et_date(d.date())
     return s <= d <= e
 
 def clamp_to_session(dt: datetime) -> datetime:
-    s, e = market_session_bounds_et(dt)
     d = to_et(dt)
+    s, e = _bounds_for_et_date(d.date())
     if d < s: return s
     if d > e: return e
     return d
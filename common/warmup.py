@@ -0,0 +1,75 @@
+# common/warmup.py
+"""
+Warm an ingest worker before it takes real work.
+
+- Imports the write-path modules (pays the import/.pyc cost up front).
+- Runs every db_writer mapper on a one-row fixture, which also generates and
+  caches the shape-specialized mappers for Polygon-style rows.
+- Optionally opens the dbutils connection pool and round-trips one query.
+
+Ingest workers call warmup() at the top of their entry points (bar builder,
+daily updater, backfill), so the process that takes the work is the one warmed.
+Running it as a module only checks the steps themselves:
+  python -m common.warmup            # imports + mappers + pool
+  python -m common.warmup --no-db    # no database access (e.g. at build time)
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from common.app_logging import setup_logger
+
+log = setup_logger("warmup")
+
+# One Polygon-style row per mapper, in the shape the backfill feeds them
+_FIXTURES = {
+    "daily":  {"t": 1_700_000_000_000, "o": 1.0, "h": 1.0, "l": 1.0, "c": 1.0, "v": 1, "vw": 1.0},
+    "minute": {"t": 1_700_000_000_000, "o": 1.0, "h": 1.0, "l": 1.0, "c": 1.0, "v": 1, "vw": 1.0},
+    "tick":   {"t": 1_700_000_000_000_000_000, "p": 1.0, "s": 1, "x": 1, "c": [0]},
+    "quote":  {"t": 1_700_000_000_000_000_000, "bp": 1.0, "bs": 1, "ap": 1.0, "as": 1, "bx": 1, "ax": 1},
+}
+
+
+def warm_mappers() -> None:
+    from common import db_writer as w
+    mappers = {
+        "daily": w._map_daily_row,
+        "minute": w._map_minute_row,
+        "tick": w._map_tick_row,
+        "quote": w._map_quote_row,
+    }
+    for kind, generic in mappers.items():
+        row = _FIXTURES[kind]
+        w._specialized_mapper(generic, row)(row, symbol="WARMUP")
+
+
+def warm_pool() -> None:
+    from common import dbutils
+    # connection() opens the process pool on first use; one query fills it
+    if not dbutils.health_check():
+        raise RuntimeError("database not reachable")
+
+
+def warmup(*, db: bool = True) -> float:
+    """Run the warmup steps; returns elapsed seconds."""
+    t0 = time.perf_counter()
+    try:
+        warm_mappers()
+    except Exception as e:
+        log.warning(f"mapper warmup skipped: {e}")
+    if db:
+        try:
+            warm_pool()
+        except Exception as e:
+            log.warning(f"pool warmup skipped: {e}")
+    elapsed = time.perf_counter() - t0
+    log.info(f"warmup done in {elapsed:.3f}s")
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-db", action="store_true", help="skip pool/database warmup")
+    args = parser.parse_args()
+    warmup(db=not args.no_db)
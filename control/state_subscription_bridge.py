@@ -5,10 +5,12 @@ from __future__ import annotations
 
 import json
 import logging
+import select
 import signal
 import threading
 import time
-from typing import Dict, Optional, List, Tuple, Set
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, List, Tuple, Set
 
 from common.creds import get_pg_dsn, get_redis_url
 
@@ -20,10 +22,32 @@ except Exception as e:
 try:
     import psycopg2
     import psycopg2.extras
+    import psycopg2.pool
     from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 except Exception as e:
     raise RuntimeError("Missing dependency 'psycopg2-binary'. Install with: pip install psycopg2-binary") from e
 
+try:
+    from sortedcontainers import SortedList
+except ImportError:
+    SortedList = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Compact JSON for Redis/notify payloads; orjson when installed (returns bytes,
+# which redis publish/set accept as-is)
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
 STATE_ORDER = {"COLD": 0, "WARM": 1, "HOT": 2}
 VALID_STATES = set(STATE_ORDER.keys())
 SRC_OVERRIDE = "override"
@@ -34,6 +58,27 @@ SOURCE_PRIORITY = [SRC_OVERRIDE, SRC_EVAL, SRC_CHART, SRC_DB]
 
 CHART_TTL_SEC = 45
 DEBOUNCE_MS = 150
+HEALTH_TTL_SEC = 10  # health key expires if the bridge stops refreshing it
+RECONCILE_SEC = 60.0  # pushes send deltas; a full replace at most this often
+NOTIFY_BATCH_MAX = 1000  # notifies applied per poll before re-checking stop
+
+
+class _CachedSecondFormatter(logging.Formatter):
+    """Default asctime format, but strftime runs once per second, not per record."""
+    _cache: Tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        sec = int(record.created)
+        cached = self._cache
+        if cached[0] != sec:
+            cached = self._cache = (sec, time.strftime(self.default_time_format, self.converter(sec)))
+        return self.default_msec_format % (cached[1], record.msecs)
+
+
+def _apply_delta(mirror: "SortedList", old: Set[str], new: Set[str]) -> None:
+    for sym in old - new:
+        mirror.discard(sym)
+    mirror.update(new - old)
 
 
 class StateSubscriptionBridge:
@@ -57,7 +102,7 @@ class StateSubscriptionBridge:
         self.log = logging.getLogger("StateBridge")
         if not self.log.handlers:
             h = logging.StreamHandler()
-            fmt = logging.Formatter("[%(asctime)s] %(name)s %(levelname)s: %(message)s")
+            fmt = _CachedSecondFormatter("[%(asctime)s] %(name)s %(levelname)s: %(message)s")
             h.setFormatter(fmt)
             self.log.addHandler(h)
         self.log.setLevel(level)
@@ -70,9 +115,10 @@ class StateSubscriptionBridge:
         self.r = redis.from_url(self.redis_url, decode_responses=True)
         self.pub = self.r
 
-        # Postgres
+        # Postgres: pg_conn is reserved for LISTEN; queries go through _pool
         self.pg_conn = None  # type: ignore
         self.pg_cur = None   # type: ignore
+        self._pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
 
         # Schema / channels
         self.db_notify_channel = db_notify_channel
@@ -89,14 +135,22 @@ class StateSubscriptionBridge:
         self.health_key = health_key
 
         # State maps
-        self.state_by_source: Dict[str, Dict[str, str]] = {SRC_DB: {}, SRC_EVAL: {}, SRC_OVERRIDE: {}, SRC_CHART: {}}
-        self.chart_ts: Dict[str, float] = {}
+        self.state_by_source: Dict[str, Dict[str, str]] = {SRC_DB: {}, SRC_EVAL: {}, SRC_OVERRIDE: {}}
+        # chart source: sym -> (last seen, state); one entry instead of two parallel dicts
+        self.chart: Dict[str, Tuple[float, str]] = {}
 
         self.eff_warm: Set[str] = set()
         self.eff_hot: Set[str] = set()
+        self._last_replace = 0.0  # monotonic time of the last full replace
+        # sorted mirrors of eff_hot / eff_warm|eff_hot, updated by deltas only
+        self._hot_sorted = SortedList() if SortedList is not None else None
+        self._warmhot_sorted = SortedList() if SortedList is not None else None
 
         self._stop_evt = threading.Event()
         self._push_evt = threading.Event()
+        # bare-symbol notifies, resolved in one query per debounce window
+        self._pending_db_lookups: Set[str] = set()
+        self._pending_lock = threading.Lock()
         self._threads: List[threading.Thread] = []
 
         self.metrics = {"updates_in": 0, "db_boot_count": 0, "db_notify_in": 0, "push_out": 0, "chart_expired": 0}
@@ -128,6 +182,8 @@ class StateSubscriptionBridge:
                 self.pg_cur.close()
             if self.pg_conn:
                 self.pg_conn.close()
+            if self._pool:
+                self._pool.closeall()
         except Exception:
             pass
         self.log.info("StateSubscriptionBridge stopped.")
@@ -149,6 +205,17 @@ class StateSubscriptionBridge:
         self.pg_cur = self.pg_conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
         self.pg_cur.execute(f"LISTEN {self.db_notify_channel};")
         self.log.info("LISTEN on Postgres channel: %s", self.db_notify_channel)
+        # bootstrap/lookups never wait on (or block) the notify poll connection
+        self._pool = psycopg2.pool.ThreadedConnectionPool(2, 8, dsn=self.pg_dsn)
+
+    @contextmanager
+    def _pooled_conn(self) -> Iterator["psycopg2.extensions.connection"]:
+        conn = self._pool.getconn()
+        try:
+            conn.autocommit = True
+            yield conn
+        finally:
+            self._pool.putconn(conn)
 
     def _bootstrap_from_db(self) -> None:
         has_dnt = self._column_exists(self.tab, self.col_dnt)
@@ -183,19 +250,17 @@ class StateSubscriptionBridge:
                 WHERE table_name = %s AND column_name = %s
                 LIMIT 1
             """
-            cur = self.pg_conn.cursor()
-            cur.execute(sql, (table, col))
-            return cur.fetchone() is not None
+            with self._pooled_conn() as conn, conn.cursor() as cur:
+                cur.execute(sql, (table, col))
+                return cur.fetchone() is not None
         except Exception:
             self.log.debug("column_exists check failed; assuming column missing.", exc_info=True)
             return False
 
     def _pg_query(self, sql: str, args: Optional[Tuple] = None) -> List[Dict]:
-        cur = self.pg_conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-        cur.execute(sql, args or ())
-        rows = cur.fetchall()
-        cur.close()
-        return rows
+        with self._pooled_conn() as conn, conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            cur.execute(sql, args or ())
+            return cur.fetchall()
 
     def _start_db_notify_listener(self) -> None:
         t = threading.Thread(target=self._db_notify_loop, name="StateBridge-DBNotify", daemon=True)
@@ -205,19 +270,28 @@ class StateSubscriptionBridge:
     def _db_notify_loop(self) -> None:
         while not self._stop_evt.is_set():
             try:
-                self.pg_conn.poll()
-                while self.pg_conn.notifies:
-                    note = self.pg_conn.notifies.pop(0)
-                    self.metrics["db_notify_in"] += 1
-                    self._apply_db_notification(note.payload)
+                notifies = self.pg_conn.notifies
+                if not notifies:
+                    # block until the socket is readable (1s cap to see _stop_evt)
+                    readable, _, _ = select.select([self.pg_conn], [], [], 1.0)
+                    if not readable:
+                        continue
+                    self.pg_conn.poll()
+                if notifies:
+                    batch = notifies[:NOTIFY_BATCH_MAX]
+                    del notifies[:len(batch)]
+                    self.metrics["db_notify_in"] += len(batch)
+                    for note in batch:
+                        self._apply_db_notification(note.payload)
+                    self._schedule_push()  # once per batch
             except Exception:
                 self.log.exception("DB notify loop error")
                 time.sleep(1.0)
-            time.sleep(0.2)
 
     def _apply_db_notification(self, payload: str) -> None:
+        # caller schedules the push once per drained batch
         try:
-            data = json.loads(payload)
+            data = _loads(payload)
             items = []
             if "batch" in data and isinstance(data["batch"], list):
                 items = data["batch"]
@@ -231,20 +305,27 @@ class StateSubscriptionBridge:
                 st = str(it["state"]).upper()
                 if st in VALID_STATES:
                     self.state_by_source[SRC_DB][sym] = st
-            self._schedule_push()
         except Exception:
             sym = payload.strip().upper()
             if sym:
-                sql = f"SELECT {self.col_state} FROM {self.tab} WHERE {self.col_sym}=%s"
-                try:
-                    rows = self._pg_query(sql, (sym,))
-                    if rows:
-                        st = str(rows[0][self.col_state]).upper()
-                        if st in VALID_STATES:
-                            self.state_by_source[SRC_DB][sym] = st
-                            self._schedule_push()
-                except Exception:
-                    self.log.exception("DB lookup failed for symbol from notify: %s", sym)
+                with self._pending_lock:
+                    self._pending_db_lookups.add(sym)
+
+    def _drain_db_lookups(self) -> None:
+        with self._pending_lock:
+            pending, self._pending_db_lookups = self._pending_db_lookups, set()
+        if not pending:
+            return
+        sql = f"SELECT {self.col_sym} AS symbol, {self.col_state} AS state FROM {self.tab} WHERE {self.col_sym} = ANY(%s)"
+        try:
+            rows = self._pg_query(sql, (sorted(pending),))
+        except Exception:
+            self.log.exception("DB lookup failed for %d symbols from notify", len(pending))
+            return
+        for r in rows:
+            st = str(r["state"]).upper()
+            if st in VALID_STATES:
+                self.state_by_source[SRC_DB][str(r["symbol"]).upper()] = st
 
     # ----- Redis inputs (Evaluator / Override / Chart) -----
     def _start_redis_in_listeners(self) -> None:
@@ -259,20 +340,22 @@ class StateSubscriptionBridge:
             self._threads.append(t)
 
     def _redis_in_loop(self, source: str, channel: str) -> None:
-        ps = self.r.pubsub()
+        # subscribe confirmations are dropped inside redis-py; get_message lets
+        # the loop see _stop_evt at least once a second
+        ps = self.r.pubsub(ignore_subscribe_messages=True)
         ps.subscribe(channel)
         self.log.info("Listening Redis source=%s channel=%s", source, channel)
-        for msg in ps.listen():
-            if self._stop_evt.is_set():
-                break
-            if msg.get("type") != "message":
+        while not self._stop_evt.is_set():
+            msg = ps.get_message(timeout=1.0)
+            if not msg:
                 continue
             try:
-                payload = json.loads(msg["data"])
+                payload = _loads(msg["data"])
                 self._apply_source_payload(source, payload)
                 self.metrics["updates_in"] += 1
             except Exception:
                 self.log.exception("Invalid payload on %s: %s", channel, msg)
+        ps.close()
 
     def _apply_source_payload(self, source: str, payload: Dict) -> None:
         items: List[Dict] = []
@@ -292,8 +375,7 @@ class StateSubscriptionBridge:
             if not sym or st not in VALID_STATES:
                 continue
             if source == SRC_CHART:
-                self.chart_ts[sym] = now
-                self.state_by_source[SRC_CHART][sym] = st
+                self.chart[sym] = (now, st)
             else:
                 self.state_by_source[source][sym] = st
             changed = True
@@ -317,6 +399,7 @@ class StateSubscriptionBridge:
             time.sleep(DEBOUNCE_MS / 1000.0)
             self._push_evt.clear()
             try:
+                self._drain_db_lookups()
                 self._recompute_and_push(reason="debounced-update")
             except Exception:
                 self.log.exception("Recompute/push failed")
@@ -324,48 +407,73 @@ class StateSubscriptionBridge:
     def _recompute_and_push(self, *, reason: str) -> None:
         new_warm, new_hot = self._compute_effective()
         if new_warm != self.eff_warm or new_hot != self.eff_hot:
+            old_hot, old_warmhot = self.eff_hot, self.eff_warm | self.eff_hot
+            new_warmhot = new_warm | new_hot
             self.eff_warm, self.eff_hot = new_warm, new_hot
-            self._publish_control(new_hot, new_warm | new_hot)
+            if self._hot_sorted is not None:
+                _apply_delta(self._hot_sorted, old_hot, new_hot)
+                _apply_delta(self._warmhot_sorted, old_warmhot, new_warmhot)
+            now = time.monotonic()
+            if now - self._last_replace >= RECONCILE_SEC:
+                # periodic full set: heals consumers that missed a delta
+                self._publish_control(new_hot, new_warmhot)
+                self._last_replace = now
+            else:
+                self._publish_deltas(old_hot, new_hot, old_warmhot, new_warmhot)
             self.metrics["push_out"] += 1
             self.log.info(
                 "Pushed subs (%s): HOT=%d, WARM+HOT=%d",
-                reason, len(new_hot), len(new_warm | new_hot)
+                reason, len(new_hot), len(new_warmhot)
             )
         else:
             self.log.debug("No effective change (%s).", reason)
 
     def _compute_effective(self) -> Tuple[Set[str], Set[str]]:
-        symbols: Set[str] = set()
-        for srcmap in self.state_by_source.values():
-            symbols.update(srcmap.keys())
+        # Lowest priority first: each higher source overwrites in one C-level
+        # dict.update, so there is no per-symbol priority walk.
+        now = time.time()
+        effective: Dict[str, str] = {}
+        for src in reversed(SOURCE_PRIORITY):
+            if src == SRC_CHART:
+                # expired chart entries must not shadow lower-priority sources
+                effective.update({sym: st for sym, (ts, st) in list(self.chart.items()) if now - ts <= CHART_TTL_SEC})
+            else:
+                effective.update(self.state_by_source[src])
         warm: Set[str] = set()
         hot: Set[str] = set()
-        for sym in symbols:
-            st = self._effective_state_for(sym)
+        add_warm, add_hot = warm.add, hot.add  # hoisted out of the per-symbol loop
+        for sym, st in effective.items():
             if st == "HOT":
-                hot.add(sym)
+                add_hot(sym)
             elif st == "WARM":
-                warm.add(sym)
+                add_warm(sym)
         return warm, hot
 
-    def _effective_state_for(self, sym: str) -> str:
-        now = time.time()
-        for src in SOURCE_PRIORITY:
-            st = self.state_by_source[src].get(sym)
-            if st is None:
-                continue
-            if src == SRC_CHART:
-                ts = self.chart_ts.get(sym, 0.0)
-                if now - ts > CHART_TTL_SEC:
-                    continue
-            return st
-        return "COLD"
-
     def _publish_control(self, hot: Set[str], warmhot: Set[str]) -> None:
-        hot_list = sorted(list(hot))
-        warmhot_list = sorted(list(warmhot))
-        self.pub.publish(self.ctl_ticks, json.dumps({"op": "replace", "channel": "T", "symbols": hot_list}, separators=(",", ":")))
-        self.pub.publish(self.ctl_quotes, json.dumps({"op": "replace", "channel": "Q", "symbols": warmhot_list}, separators=(",", ":")))
+        if self._hot_sorted is not None:
+            hot_list, warmhot_list = list(self._hot_sorted), list(self._warmhot_sorted)
+        else:
+            hot_list, warmhot_list = sorted(hot), sorted(warmhot)
+        ticks_msg = _dumps({"op": "replace", "channel": "T", "symbols": hot_list})
+        quotes_msg = _dumps({"op": "replace", "channel": "Q", "symbols": warmhot_list})
+        # both control messages in one round-trip
+        with self.pub.pipeline(transaction=False) as pipe:
+            pipe.publish(self.ctl_ticks, ticks_msg)
+            pipe.publish(self.ctl_quotes, quotes_msg)
+            pipe.execute()
+
+    def _publish_deltas(self, old_hot: Set[str], hot: Set[str], old_warmhot: Set[str], warmhot: Set[str]) -> None:
+        msgs = []
+        for chan_key, channel, old, new in ((self.ctl_ticks, "T", old_hot, hot), (self.ctl_quotes, "Q", old_warmhot, warmhot)):
+            for op, syms in (("unsubscribe", old - new), ("subscribe", new - old)):
+                if syms:
+                    msgs.append((chan_key, _dumps({"op": op, "channel": channel, "symbols": sorted(syms)})))
+        if not msgs:
+            return
+        with self.pub.pipeline(transaction=False) as pipe:
+            for chan_key, msg in msgs:
+                pipe.publish(chan_key, msg)
+            pipe.execute()
 
     # ----- Chart TTL -----
     def _start_chart_ttl_expirer(self) -> None:
@@ -377,11 +485,10 @@ class StateSubscriptionBridge:
         while not self._stop_evt.is_set():
             try:
                 now = time.time()
-                expired = [s for s, ts in list(self.chart_ts.items()) if now - ts > CHART_TTL_SEC]
+                expired = [s for s, (ts, _) in list(self.chart.items()) if now - ts > CHART_TTL_SEC]
                 if expired:
                     for s in expired:
-                        self.chart_ts.pop(s, None)
-                        self.state_by_source[SRC_CHART].pop(s, None)
+                        self.chart.pop(s, None)
                     self.metrics["chart_expired"] += len(expired)
                     self._schedule_push()
             except Exception:
@@ -403,14 +510,15 @@ class StateSubscriptionBridge:
                         "db": len(self.state_by_source[SRC_DB]),
                         "evaluator": len(self.state_by_source[SRC_EVAL]),
                         "override": len(self.state_by_source[SRC_OVERRIDE]),
-                        "chart": len(self.state_by_source[SRC_CHART]),
+                        "chart": len(self.chart),
                         "eff_hot": len(self.eff_hot),
                         "eff_warm": len(self.eff_warm),
                     },
                     "metrics": self.metrics,
                     "ts": int(time.time() * 1000),
                 }
-                self.r.set(self.health_key, json.dumps(payload, separators=(",", ":")))
+                # fresh ts every cycle; the key lapses if the bridge stops refreshing it
+                self.r.set(self.health_key, _dumps(payload), ex=HEALTH_TTL_SEC)
             except Exception:
                 self.log.debug("Health publish failed", exc_info=True)
             time.sleep(2.0)
@@ -1,15 +1,29 @@
 from collections import deque
+from itertools import islice
 
 class DoubleRingBuffer:
+    # One deque per stream; the short window is the tail of the long one,
+    # so each tick costs a single append.
     def __init__(self, short=256, long=4096):
-        self.trades = deque(maxlen=short)
-        self.quotes = deque(maxlen=short)
+        self.short = min(short, long)
         self.trades_long = deque(maxlen=long)
         self.quotes_long = deque(maxlen=long)
 
+    def _tail(self, buf):
+        # newest `short` items, oldest first
+        return list(islice(reversed(buf), self.short))[::-1]
+
+    @property
+    def trades(self):
+        return self._tail(self.trades_long)
+    @property
+    def quotes(self):
+        return self._tail(self.quotes_long)
+
     def add_trade(self, t):
-        self.trades.append(t); self.trades_long.append(t)
+        self.trades_long.append(t)
     def add_quote(self, q):
-        self.quotes.append(q); self.quotes_long.append(q)
+        self.quotes_long.append(q)
     def stats(self):
-        return { 'trades_short': len(self.trades), 'quotes_short': len(self.quotes) }
+        return { 'trades_short': min(self.short, len(self.trades_long)),
+                 'quotes_short': min(self.short, len(self.quotes_long)) }
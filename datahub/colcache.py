@@ -0,0 +1,136 @@
+# datahub/colcache.py
+# Local columnar cache for the DataHub: one Parquet file per (kind, symbol, day),
+#   <DATA_DIR>/cache/<kind>/<SYMBOL>/<YYYY-MM-DD>.parquet
+# Only complete sessions (days before today) are cached.
+# Recently served tables are also kept in a small in-process LRU in front of the files.
+# Writers of the DataHub tables (daily_bars/minute_bars/ticks) call invalidate() for the
+# days they change, so the next read reloads from the DB.
+from __future__ import annotations
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from common.config import DATA_DIR
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+CACHE_ROOT = os.getenv("REFLEX_DATAHUB_CACHE", os.path.join(DATA_DIR, "cache"))
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+MEM_MAX_ENTRIES = int(os.getenv("REFLEX_DATAHUB_MEMCACHE", "256"))
+
+# key -> (table, mtime_ns of its file); a hit is only served while the file is unchanged
+_mem: "OrderedDict[Tuple[str, str, date], Tuple[pa.Table, int]]" = OrderedDict()
+_mem_lock = threading.Lock()  # endpoints load from worker threads
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _mem_get(key, path: str):
+    with _mem_lock:
+        hit = _mem.get(key)
+    if hit is None:
+        return None
+    if _mtime_ns(path) != hit[1]:  # rewritten or invalidated (maybe by another process)
+        with _mem_lock:
+            if _mem.get(key) is hit:
+                del _mem[key]
+        return None
+    with _mem_lock:
+        if key in _mem:
+            _mem.move_to_end(key)
+    return hit[0]
+
+def _mem_put(key, path: str, table) -> None:
+    if MEM_MAX_ENTRIES <= 0:
+        return
+    stamp = _mtime_ns(path)
+    if stamp is None:
+        return
+    with _mem_lock:
+        _mem[key] = (table, stamp)
+        _mem.move_to_end(key)
+        while len(_mem) > MEM_MAX_ENTRIES:
+            _mem.popitem(last=False)
+
+def enabled() -> bool:
+    return pa is not None
+
+def _path(kind: str, symbol: str, day: date) -> str:
+    return os.path.join(CACHE_ROOT, kind, symbol.upper(), f"{day:%Y-%m-%d}.parquet")
+
+def read(kind: str, symbol: str, day: date) -> Optional["pa.Table"]:
+    if pa is None:
+        return None
+    key = (kind, symbol.upper(), day)
+    path = _path(kind, symbol, day)
+    table = _mem_get(key, path)
+    if table is not None:
+        return table
+    if not os.path.exists(path):
+        return None
+    table = pq.read_table(path)
+    _mem_put(key, path, table)
+    return table
+
+def write(kind: str, symbol: str, day: date, df: pd.DataFrame) -> Optional["pa.Table"]:
+    """Cache df for a finished day; returns the Arrow table (None if not cacheable)."""
+    if pa is None or df.empty or day >= datetime.now(timezone.utc).date():
+        return None
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    path = _path(kind, symbol, day)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)  # readers never see a half-written file
+    _mem_put((kind, symbol.upper(), day), path, table)
+    return table
+
+def invalidate(kind: str, symbol: str, start: Optional[date] = None, end: Optional[date] = None) -> int:
+    """Drop cached days of (kind, symbol) in [start, end] (None: open-ended); returns files removed."""
+    sym = symbol.upper()
+    folder = os.path.join(CACHE_ROOT, kind, sym)
+    try:
+        names = os.listdir(folder)
+    except FileNotFoundError:
+        names = []
+    removed = 0
+    for name in names:
+        if not name.endswith(".parquet"):
+            continue
+        try:
+            day = date.fromisoformat(name[:-len(".parquet")])
+        except ValueError:
+            continue
+        if (start is None or day >= start) and (end is None or day <= end):
+            try:
+                os.remove(os.path.join(folder, name))
+                removed += 1
+            except FileNotFoundError:
+                pass
+    with _mem_lock:
+        for key in [k for k in _mem if k[0] == kind and k[1] == sym
+                    and (start is None or k[2] >= start) and (end is None or k[2] <= end)]:
+            del _mem[key]
+    return removed
+
+def to_ipc_stream(table: "pa.Table") -> bytes:
+    """Serialize a table as an Arrow IPC stream."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches():
+            writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
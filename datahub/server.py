@@ -1,11 +1,15 @@
 # datahub/server.py
-# FastAPI DataHub: local-first, then backfill-from-Polygon, then requery from DB
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+# FastAPI DataHub: local-first (Parquet cache, then DB), then backfill-from-Polygon, then requery from DB
+import asyncio
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse, Response
 from datetime import datetime, date
-from typing import List
+from typing import Callable, List, Literal
+import orjson
 import pandas as pd
 
+from datahub import colcache
+
 from common.app_logging import setup_logger
 from common.utils import to_utc_datetime  # if you have one; otherwise inline parse
 from common.db_access import (
@@ -17,76 +21,149 @@ from polygon_api.rest import (
 )
 
 log = setup_logger("datahub.api", level="INFO")
-app = FastAPI(title="Reflex DataHub", version="1.0")
+app = FastAPI(title="Reflex DataHub", version="1.0", default_response_class=ORJSONResponse)
 
-def _ensure_daily(symbol: str, day: date) -> pd.DataFrame:
+def _invalidate(kind: str, symbol: str, day: date) -> None:
+    # these tables just changed for `day`: never serve an older cached copy
+    try:
+        colcache.invalidate(kind, symbol, day, day)
+    except OSError as e:
+        log.warning("cache invalidate failed for %s %s %s: %s", kind, symbol, day, e)
+
+def _load_daily(symbol: str, day: date) -> pd.DataFrame:
     start = datetime.combine(day, datetime.min.time())
     end   = datetime.combine(day, datetime.max.time())
     df = get_daily_bars_db(symbol, start, end)
     if not df.empty:
         return df
     live = fetch_daily_bars(symbol, day.strftime("%Y-%m-%d"))
-    if live is not None and not live.empty:
-        insert_daily_bars_db(symbol, live)
+    if live is None or live.empty:
+        return df  # nothing inserted: the empty read stands
+    insert_daily_bars_db(symbol, live)
+    _invalidate("1d", symbol, day)
+    # re-read: Polygon frames use different columns than the DB rows served on a hit
     return get_daily_bars_db(symbol, start, end)
 
-def _ensure_minute(symbol: str, day: date) -> pd.DataFrame:
+def _load_minute(symbol: str, day: date) -> pd.DataFrame:
     start = datetime.combine(day, datetime.min.time())
     end   = datetime.combine(day, datetime.max.time())
     df = get_minute_bars_db(symbol, start, end)
     if not df.empty:
         return df
     live = fetch_minute_bars(symbol, day.strftime("%Y-%m-%d"))
-    if not live.empty:
-        insert_minute_bars_db(live.assign(symbol=symbol))
+    if live.empty:
+        return df
+    insert_minute_bars_db(live.assign(symbol=symbol))
+    _invalidate("1m", symbol, day)
     return get_minute_bars_db(symbol, start, end)
 
-def _ensure_ticks(symbol: str, day: date) -> pd.DataFrame:
+def _load_ticks(symbol: str, day: date) -> pd.DataFrame:
     start = datetime.combine(day, datetime.min.time())
     end   = datetime.combine(day, datetime.max.time())
     df = get_ticks_db(symbol, start, end)
     if not df.empty:
         return df
     live = fetch_ticks(symbol, day.strftime("%Y-%m-%d"))
-    if not live.empty:
-        # reshape to match your insert schema if needed
-        live = live.assign(symbol=symbol)
-        insert_ticks_db(symbol, live)
+    if live.empty:
+        return df
+    # reshape to match your insert schema if needed
+    live = live.assign(symbol=symbol)
+    insert_ticks_db(symbol, live)
+    _invalidate("ticks", symbol, day)
     return get_ticks_db(symbol, start, end)
 
+# Finished days are served from the Parquet cache: no DB round-trips on a hit.
+def _cached_table(kind: str, symbol: str, day: date, load: Callable[[str, date], pd.DataFrame]):
+    table = colcache.read(kind, symbol, day)
+    if table is None:
+        df = load(symbol, day)
+        table = colcache.write(kind, symbol, day, df)
+        if table is None:
+            table = colcache.pa.Table.from_pandas(df, preserve_index=False)
+    return table
+
+def _cached(kind: str, symbol: str, day: date, load: Callable[[str, date], pd.DataFrame]) -> pd.DataFrame:
+    table = colcache.read(kind, symbol, day)
+    if table is not None:
+        return table.to_pandas()
+    df = load(symbol, day)
+    colcache.write(kind, symbol, day, df)  # no-op for today / unfinished days
+    return df
+
+def _ensure_daily(symbol: str, day: date) -> pd.DataFrame:
+    return _cached("1d", symbol, day, _load_daily)
+
+def _ensure_minute(symbol: str, day: date) -> pd.DataFrame:
+    return _cached("1m", symbol, day, _load_minute)
+
+def _ensure_ticks(symbol: str, day: date) -> pd.DataFrame:
+    return _cached("ticks", symbol, day, _load_ticks)
+
+# Frame payloads: records (the long-standing shape) unless the client asks for
+# format=split, i.e. {"columns": [...], "data": [[...], ...]} without per-row keys.
+FrameFormat = Literal["records", "split"]
+
+def _json_default(o):
+    if o is pd.NaT:
+        return None
+    if isinstance(o, (datetime, date)):  # incl. pd.Timestamp, which orjson won't take
+        return o.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(o).__name__}")
+
+def _frame_response(df: pd.DataFrame, fmt: FrameFormat = "records") -> Response:
+    payload = df.to_dict(orient="split", index=False) if fmt == "split" else df.to_dict(orient="records")
+    body = orjson.dumps(payload, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return Response(content=body, media_type="application/json")
+
+# Handlers are async; the blocking DB/Polygon work runs via asyncio.to_thread
+# so a slow backfill never stalls the event loop.
 @app.get("/v1/daily")
-def daily(symbol: str, day: str):
+async def daily(symbol: str, day: str, fmt: FrameFormat = Query("records", alias="format")):
     try:
         day_dt = datetime.strptime(day, "%Y-%m-%d").date()
-        df = _ensure_daily(symbol, day_dt)
-        return JSONResponse(content=df.to_dict(orient="records"))
+        df = await asyncio.to_thread(_ensure_daily, symbol, day_dt)
+        return _frame_response(df, fmt)
     except Exception as e:
         log.exception("daily error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/v1/minute")
-def minute(symbol: str, day: str):
+async def minute(symbol: str, day: str, fmt: FrameFormat = Query("records", alias="format")):
     try:
         day_dt = datetime.strptime(day, "%Y-%m-%d").date()
-        df = _ensure_minute(symbol, day_dt)
-        return JSONResponse(content=df.to_dict(orient="records"))
+        df = await asyncio.to_thread(_ensure_minute, symbol, day_dt)
+        return _frame_response(df, fmt)
     except Exception as e:
         log.exception("minute error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/v1/minute.arrow")
+async def minute_arrow(symbol: str, day: str):
+    """Minute bars as an Arrow IPC stream (no per-row JSON)."""
+    if not colcache.enabled():
+        raise HTTPException(status_code=501, detail="pyarrow not installed")
+    try:
+        day_dt = datetime.strptime(day, "%Y-%m-%d").date()
+        table = await asyncio.to_thread(_cached_table, "1m", symbol, day_dt, _load_minute)
+        body = await asyncio.to_thread(colcache.to_ipc_stream, table)
+        return Response(content=body, media_type=colcache.ARROW_STREAM_MEDIA_TYPE)
+    except Exception as e:
+        log.exception("minute.arrow error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/v1/ticks")
-def ticks(symbol: str, day: str):
+async def ticks(symbol: str, day: str, fmt: FrameFormat = Query("records", alias="format")):
     try:
         day_dt = datetime.strptime(day, "%Y-%m-%d").date()
-        df = _ensure_ticks(symbol, day_dt)
-        return JSONResponse(content=df.to_dict(orient="records"))
+        df = await asyncio.to_thread(_ensure_ticks, symbol, day_dt)
+        return _frame_response(df, fmt)
     except Exception as e:
         log.exception("ticks error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Quotes: memory-only policy — served elsewhere (e.g., cockpit) from live buffers.
 @app.get("/v1/quotes")
-def quotes(symbol: str, limit: int = 100):
+async def quotes(symbol: str, limit: int = 100):
     try:
         from shared_mem.registry import registry
         from shared_mem.buffers import symbol_buffers
@@ -94,7 +171,7 @@ def quotes(symbol: str, limit: int = 100):
             raise HTTPException(status_code=404, detail="Symbol not found")
         buffer = symbol_buffers.get(symbol, {}).get("quotes", [])
         recent = buffer[-limit:] if limit > 0 else buffer
-        return JSONResponse(content=recent)
+        return ORJSONResponse(content=recent)
     except Exception as e:
         log.exception("quotes error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))     
\ No newline at end of file
@@ -1,6 +1,7 @@
-import random, threading, time
+import threading, time
+import numpy as np
 from datahub.registry import REGISTRY
-from datahub.snapshots import update_snapshot
+from datahub.snapshots import update_snapshots
 from datahub.events import publish_event
 
 class SimFeed:
@@ -17,13 +18,14 @@ class SimFeed:
         self._stop = True
 
     def _run(self):
-        prices = {s: 100.0 + random.random()*10 for s in self.symbols}
+        # draw every symbol's move in one call per field instead of per-symbol random.*
+        rng = np.random.default_rng()
+        n = len(self.symbols)
+        prices = 100.0 + rng.random(n) * 10
         while not self._stop:
-            for s in self.symbols:
-                delta = random.uniform(-0.2, 0.2)
-                prices[s] = max(1.0, prices[s] + delta)
-                momentum = delta * 5
-                vol = random.uniform(1e5, 5e6)
-                update_snapshot(s, prices[s], vol, momentum, 'stage1_pass')
+            deltas = rng.uniform(-0.2, 0.2, n)
+            prices = np.maximum(1.0, prices + deltas)
+            vols = rng.uniform(1e5, 5e6, n)
+            update_snapshots(self.symbols, prices.tolist(), vols.tolist(), (deltas * 5).tolist(), 'stage1_pass')
             publish_event('tick.batch', payload={'n': len(self.symbols)})
             time.sleep(self.interval)
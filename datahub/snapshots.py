@@ -1,16 +1,27 @@
 from datahub.registry import REGISTRY
 from datetime import datetime, timezone
+from typing import Iterable
 
 
-def update_snapshot(symbol: str, price: float, volume: float, momentum: float, filter_status: str):
+def _apply(symbol: str, price: float, volume: float, momentum: float, filter_status: str, ts: str):
     si = REGISTRY.upsert(symbol)
     si.last_price = price
-    si.snapshot.update({
-        'last_price': price,                     # <— include explicit last price
-        'volatility': round(abs(momentum) * 0.8, 3),
-        'volume': volume,
-        'momentum': momentum,
-        'filter_status': filter_status,
-        'timestamp': datetime.now(timezone.utc).isoformat()
-    })
+    snap = si.snapshot
+    snap['last_price'] = price                   # <— include explicit last price
+    snap['volatility'] = round(abs(momentum) * 0.8, 3)
+    snap['volume'] = volume
+    snap['momentum'] = momentum
+    snap['filter_status'] = filter_status
+    snap['timestamp'] = ts
+
+
+def update_snapshot(symbol: str, price: float, volume: float, momentum: float, filter_status: str):
+    _apply(symbol, price, volume, momentum, filter_status, datetime.now(timezone.utc).isoformat())
+
 
+def update_snapshots(symbols: Iterable[str], prices: Iterable[float], volumes: Iterable[float],
+                     momenta: Iterable[float], filter_status: str):
+    """Batch form of update_snapshot: one timestamp for the whole batch."""
+    ts = datetime.now(timezone.utc).isoformat()
+    for s, p, v, m in zip(symbols, prices, volumes, momenta):
+        _apply(s, p, v, m, filter_status, ts)
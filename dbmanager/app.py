@@ -11,6 +11,7 @@
 from __future__ import annotations
 
 import logging
+import os
 from datetime import datetime
 from typing import Dict, Any
 from urllib.parse import quote_plus
@@ -73,8 +74,12 @@ def _build_engine():
         url,
         future=True,
         pool_pre_ping=True,
-        # force paging for large multi-row inserts to avoid 65k parameter limit
-        execution_options={"insertmanyvalues_page_size": 1000},
+        # low-traffic admin app: keep clear of the ingest pools' share of max_connections
+        pool_size=int(os.getenv("REFLEX_DBM_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("REFLEX_DBM_MAX_OVERFLOW", "5")),
+        pool_recycle=3600,
+        # page multi-row inserts: 5000 rows x <=13 columns stays under the 65k parameter limit
+        execution_options={"insertmanyvalues_page_size": 5000},
     )
     return engine
 
@@ -4,24 +4,13 @@ db_backfill.py
 Handles tiered backfill routines for historical market data:
 - Full: all available history
 - Moderate: recent month
-- Recent: last 2 days (with destructive refresh)
+- Recent: last 5 days, re-upserted over existing rows
 
 Uses poly_tools for data fetch and db_writer for upsert.
 """
-import subprocess
-import sys
-
-# Ensure required modules are installed
-required_packages = ["matplotlib", "pandas", "pandas_market_calendars"]
-
-for package in required_packages:
-    try:
-        __import__(package)
-    except ImportError:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, time, timedelta, timezone
-from matplotlib.pyplot import table
+from functools import lru_cache
 
 from common.poly_tools_decap import (
     fetch_daily_bars,
@@ -33,8 +22,9 @@ from common.db_writer import (
     upsert_minute_bars_for_symbol,
     upsert_ticks_for_symbol
 )
-from common.dbutils import get_connection
+from common.dbutils import pool_max_size
 from common.app_logging import setup_logger
+from common.warmup import warmup
 
 log = setup_logger("db_backfill", level="DEBUG")
 
@@ -42,6 +32,12 @@ import pandas as pd
 import pandas_market_calendars as mcal
 
 
+@lru_cache(maxsize=32)
+def _valid_days(start_iso: str, end_iso: str):
+    # building the calendar parses all holiday rules; a backfill asks for the same window repeatedly
+    return mcal.get_calendar("NYSE").valid_days(start_date=start_iso, end_date=end_iso)
+
+
 def last_market_day_check(reference_dt: datetime = None) -> datetime:
     """
     Returns the most recent valid US market day before or on reference_dt.
@@ -54,10 +50,9 @@ def last_market_day_check(reference_dt: datetime = None) -> datetime:
     else:
         dt = reference_dt
     print("step 1")
-    nyse = mcal.get_calendar("NYSE")
-    schedule = nyse.valid_days(
-        start_date=(dt - timedelta(days=10)).date().isoformat(),
-        end_date=dt.date().isoformat()
+    schedule = _valid_days(
+        (dt - timedelta(days=10)).date().isoformat(),
+        dt.date().isoformat()
     )
 
     if schedule.empty:
@@ -75,71 +70,50 @@ def last_market_day_check(reference_dt: datetime = None) -> datetime:
 
 
 
-def ingest_daily(symbols, start, end):
-    log.info(f"[🟦] Ingesting daily bars: {start} → {end}")
-    errors = []
-    for symbol in symbols:
+BACKFILL_WORKERS = 16  # concurrent symbols; Polygon fetches are network-bound
+
+
+def _ingest(stage, label, fetch, upsert, symbols, start, end, workers=BACKFILL_WORKERS):
+    # Symbols are independent: fetch+upsert each one on a worker thread so the
+    # HTTP round-trips overlap. Errors come back in symbol order.
+    def one(symbol):
         try:
-            raw = fetch_daily_bars(symbol, start, end)
+            raw = fetch(symbol, start, end)
             records = _normalize_records(raw)
             if not records:
                 raise ValueError("No rows returned")
-            upsert_daily_bars_for_symbol(symbol, records)
+            upsert(symbol, records)
         except Exception as e:
-            log.error(f"[❌] Daily bars failed for {symbol}: {e}")
-            errors.append((symbol, "daily", str(e)))
-    return errors
+            log.error(f"[❌] {label} failed for {symbol}: {e}")
+            return (symbol, stage, str(e))
+        return None
+
+    symbols = list(symbols)
+    # each worker holds a pooled connection while it upserts; more workers than
+    # the pool has connections would just queue into PoolTimeout
+    cap = pool_max_size()
+    n = max(1, min(workers, len(symbols), cap or workers))
+    with ThreadPoolExecutor(max_workers=n, thread_name_prefix=f"backfill-{stage}") as ex:
+        return [err for err in ex.map(one, symbols) if err is not None]
+
+def ingest_daily(symbols, start, end):
+    log.info(f"[🟦] Ingesting daily bars: {start} → {end}")
+    return _ingest("daily", "Daily bars", fetch_daily_bars, upsert_daily_bars_for_symbol, symbols, start, end)
 
 def ingest_minute(symbols, start, end):
     log.info(f"[🟨] Ingesting minute bars: {start} → {end}")
-    errors = []
-    for symbol in symbols:
-        try:
-            log.debug(f"[🔸] Minute fetch for {symbol}")
-            raw = fetch_minute_bars(symbol, start, end)
-            records = _normalize_records(raw)
-            if not records:
-                raise ValueError("No rows returned")
-            upsert_minute_bars_for_symbol(symbol, records)
-        except Exception as e:
-            log.error(f"[❌] Minute bars failed for {symbol}: {e}")
-            errors.append((symbol, "minute", str(e)))
-    return errors
+    return _ingest("minute", "Minute bars", fetch_minute_bars, upsert_minute_bars_for_symbol, symbols, start, end)
 
 def ingest_tick(symbols, start, end):
     log.info(f"[🟥] Ingesting tick data: {start} → {end}")
-    errors = []
-    for symbol in symbols:
-        try:
-            log.debug(f"[🔻] Tick fetch for {symbol}")
-            raw = fetch_ticks(symbol, start, end)
-            records = _normalize_records(raw)
-            if not records:
-                raise ValueError("No rows returned")
-            upsert_ticks_for_symbol(symbol, records)
-        except Exception as e:
-            log.error(f"[❌] Tick data failed for {symbol}: {e}")
-            errors.append((symbol, "tick", str(e)))
-    return errors
+    return _ingest("tick", "Tick data", fetch_ticks, upsert_ticks_for_symbol, symbols, start, end)
 
 def refresh_recent(symbols):
     now = last_market_day_check()
     cutoff = now - timedelta(days=5)
     log.info(f"[♻️] Refreshing recent data: {cutoff} → {now}")
-
-    for table in ['daily_bars', 'minute_bars', 'ticks']:
-        try:
-            log.debug(f"[🧹] Deleting recent rows from {table}")
-            conn = get_connection()
-            cur = conn.cursor()
-            delete_query = f"DELETE FROM {table} WHERE timestamp >= %s AND symbol = ANY(%s)"
-            cur.execute(delete_query, (cutoff, symbols))
-            conn.commit()
-            cur.close()
-            conn.close()
-        except Exception as e:
-            log.error(f"[❌] Failed to delete from {table}: {e}")
-
+    # No DELETE pass: every writer upserts ON CONFLICT (symbol, day|ts) DO UPDATE,
+    # so re-ingesting the window overwrites recent rows in place.
     errors = []
     errors += ingest_daily(symbols, None, now)
     errors += ingest_minute(symbols, cutoff, now)
@@ -174,6 +148,7 @@ def prime_full(symbols):
 def run_backfill(symbols, mode="recent"):
     mode = mode.lower()
     log.info(f"[🚀] Starting backfiller mode: {mode}")
+    warmup()
     if mode == "recent":
         refresh_recent(symbols)
     elif mode == "moderate":
@@ -7,6 +7,7 @@ import pandas as pd
 from shared_mem.buffers import symbol_buffers
 from shared_mem.registry import registry
 from common.db_writer import upsert_minute_bars_for_symbol
+from common.warmup import warmup
 from diagnostics.model_logger import log_model_decision
 
 REPLAY_MODE = os.getenv("REFLEXION_REPLAY", "false").lower() == "true"
@@ -31,6 +32,7 @@ def build_minute_bar(symbol):
 
 def start_bar_builder():
     print("[📊] Bar builder started...")
+    warmup()
     interval = 60 if not REPLAY_MODE else 0.01  # accelerate in replay mode
 
     while True:
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 import pandas_market_calendars as mcal
 from polygon_api.rest import fetch_daily_bars
 from common.db_writer import upsert_daily_bars_for_symbol
+from common.warmup import warmup
 from shared_mem.registry import registry
 from diagnostics.model_logger import log_model_decision
 
@@ -26,6 +27,7 @@ def get_last_market_day(reference_date=None):
 
 def start_daily_bar_updater():
     print("[📅] Daily bar updater started...")
+    warmup()
     interval = 3600 if not REPLAY_MODE else 86400  # 1h live, 1d replay
 
     while True:
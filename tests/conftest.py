@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def pg_dsn():
+    """DSN of a scratch Postgres database (REFLEX_TEST_DSN); DB tests skip without one."""
+    dsn = os.getenv("REFLEX_TEST_DSN")
+    if not dsn:
+        pytest.skip("REFLEX_TEST_DSN not set")
+    psycopg = pytest.importorskip("psycopg")
+    try:
+        psycopg.connect(dsn, connect_timeout=3).close()
+    except psycopg.Error as e:
+        pytest.skip(f"test database unreachable: {e}")
+    return dsn
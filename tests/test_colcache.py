@@ -0,0 +1,38 @@
+from datetime import date, datetime, timezone
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from datahub import colcache
+
+
+@pytest.fixture
+def cache_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(colcache, "CACHE_ROOT", str(tmp_path))
+    colcache._mem.clear()
+    yield tmp_path
+    colcache._mem.clear()
+
+
+def test_invalidate_drops_file_and_memory_entry(cache_root):
+    d1, d2 = date(2024, 1, 2), date(2024, 1, 5)
+    colcache.write("1m", "aapl", d1, pd.DataFrame({"a": [1, 2]}))
+    colcache.write("1m", "aapl", d2, pd.DataFrame({"a": [1]}))
+    assert colcache.read("1m", "AAPL", d1).num_rows == 2
+
+    assert colcache.invalidate("1m", "AAPL", date(2024, 1, 1), date(2024, 1, 3)) == 1
+    assert colcache.read("1m", "AAPL", d1) is None
+    assert colcache.read("1m", "AAPL", d2).num_rows == 1
+
+
+def test_memory_hit_not_served_after_file_removed(cache_root):
+    day = date(2024, 1, 2)
+    colcache.write("1d", "MSFT", day, pd.DataFrame({"a": [1]}))
+    (cache_root / "1d" / "MSFT" / "2024-01-02.parquet").unlink()  # e.g. another process invalidated it
+    assert colcache.read("1d", "MSFT", day) is None
+
+
+def test_today_is_not_cached(cache_root):
+    assert colcache.write("1m", "AAPL", datetime.now(timezone.utc).date(), pd.DataFrame({"a": [1]})) is None
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from common import db_writer
+
+
+def _capture_writes(monkeypatch):
+    calls = []
+
+    def fake_bulk_upsert(table, cols, rows, **kwargs):
+        calls.append((table, cols, list(rows)))
+        return len(calls[-1][2])
+
+    monkeypatch.setattr(db_writer, "bulk_upsert", fake_bulk_upsert)
+    return calls
+
+
+def test_upsert_ticks_from_frame_tz_aware(monkeypatch):
+    calls = _capture_writes(monkeypatch)
+    ts = pd.to_datetime(["2024-01-02 15:00:00", "2024-01-02 15:00:01"]).tz_localize("America/New_York")
+    frame = pd.DataFrame({"ts": ts, "price": [10.5, 10.75], "size": [100, 200]})
+
+    assert db_writer.upsert_ticks_from_frame("AAPL", frame) == 2
+    (_, cols, rows), = calls
+    assert cols == db_writer.TICK_COLS[:db_writer.TICK_REQUIRED]
+    # 15:00 ET on 2024-01-02 is 20:00 UTC
+    assert [r[1] for r in rows] == [1704225600000000, 1704225601000000]
+    assert rows[0] == ("AAPL", 1704225600000000, 10.5, 100)
+
+
+def test_upsert_ticks_from_frame_rejects_nat(monkeypatch):
+    _capture_writes(monkeypatch)
+    frame = pd.DataFrame({
+        "ts": pd.Series([pd.Timestamp("2024-01-02 20:00", tz="UTC"), pd.NaT]),
+        "price": [1.0, 2.0], "size": [1, 2],
+    })
+    with pytest.raises(ValueError, match="NaT"):
+        db_writer.upsert_ticks_from_frame("AAPL", frame)
@@ -0,0 +1,70 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from common import dbutils
+
+
+@pytest.fixture
+def bars(pg_dsn):
+    dbutils.execute(
+        "DROP TABLE IF EXISTS _t_bars;"
+        "CREATE TABLE _t_bars (symbol text, ts timestamptz, volume bigint, close double precision,"
+        " PRIMARY KEY (symbol, ts))",
+        dsn=pg_dsn,
+    )
+    yield "_t_bars"
+    dbutils.execute("DROP TABLE IF EXISTS _t_bars", dsn=pg_dsn)
+
+
+# loose types as df.to_dict("records") and hand-built rows produce them
+LOOSE_ROWS = [
+    {"symbol": "A", "ts": datetime(2024, 1, 2, 15, 30), "volume": 1200.0, "close": 10},
+    {"symbol": "B", "ts": date(2024, 1, 2), "volume": 7.0, "close": 1.5},
+    {"symbol": "C", "ts": "2024-01-02T15:31:00Z", "volume": 3, "close": "2.25"},
+]
+
+
+def _read(table, dsn):
+    return dbutils.query_all(f"SELECT symbol, ts, volume, close FROM {table} ORDER BY symbol", dsn=dsn)
+
+
+@pytest.mark.parametrize("write", ["bulk_upsert", "copy_upsert"])
+def test_upsert_paths_accept_loose_types(bars, pg_dsn, write):
+    fn = getattr(dbutils, write)
+    assert fn(bars, LOOSE_ROWS, conflict_cols=["symbol", "ts"], dsn=pg_dsn) == 3
+    got = _read(bars, pg_dsn)
+    assert [r["volume"] for r in got] == [1200, 7, 3]
+    assert [r["close"] for r in got] == [10.0, 1.5, 2.25]
+    assert got[2]["ts"] == datetime(2024, 1, 2, 15, 31, tzinfo=timezone.utc)
+
+
+def test_upsert_paths_agree(bars, pg_dsn):
+    dbutils.bulk_upsert(bars, LOOSE_ROWS, conflict_cols=["symbol", "ts"], dsn=pg_dsn)
+    via_insert = _read(bars, pg_dsn)
+    dbutils.execute(f"TRUNCATE {bars}", dsn=pg_dsn)
+    dbutils.copy_upsert(bars, LOOSE_ROWS, conflict_cols=["symbol", "ts"], dsn=pg_dsn)
+    assert _read(bars, pg_dsn) == via_insert
+
+
+def test_copy_upsert_binary_needs_exact_types(bars, pg_dsn):
+    exact = [{"symbol": "A", "ts": datetime(2024, 1, 2, tzinfo=timezone.utc), "volume": 5, "close": 1.0}]
+    assert dbutils.copy_upsert(bars, exact, conflict_cols=["symbol", "ts"], dsn=pg_dsn, binary=True) == 1
+    with pytest.raises(Exception):
+        dbutils.copy_upsert(bars, LOOSE_ROWS[:1], conflict_cols=["symbol", "ts"], dsn=pg_dsn, binary=True)
+
+
+@pytest.mark.parametrize("use_copy", [False, True])
+def test_bulk_insert_accepts_loose_types(bars, pg_dsn, use_copy):
+    assert dbutils.bulk_insert(bars, LOOSE_ROWS, dsn=pg_dsn, use_copy=use_copy) == 3
+    assert [r["volume"] for r in _read(bars, pg_dsn)] == [1200, 7, 3]
+
+
+def test_bulk_insert_defaults_to_insert(bars, pg_dsn):
+    # COPY is opt-in; the default must keep working for INSERT-only relations
+    dbutils.execute(f"CREATE VIEW _t_bars_v AS SELECT * FROM {bars}", dsn=pg_dsn)
+    try:
+        assert dbutils.bulk_insert("_t_bars_v", LOOSE_ROWS, dsn=pg_dsn) == 3
+    finally:
+        dbutils.execute("DROP VIEW _t_bars_v", dsn=pg_dsn)
+    assert len(_read(bars, pg_dsn)) == 3
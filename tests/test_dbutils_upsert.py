@@ -0,0 +1,61 @@
+import pytest
+
+from common import dbutils
+
+
+@pytest.fixture
+def quotes(pg_dsn):
+    dbutils.execute(
+        "DROP TABLE IF EXISTS _t_up;"
+        "CREATE TABLE _t_up (symbol text, ts bigint, price double precision, venue text,"
+        " PRIMARY KEY (symbol, ts))",
+        dsn=pg_dsn,
+    )
+    yield "_t_up"
+    dbutils.execute("DROP TABLE IF EXISTS _t_up", dsn=pg_dsn)
+
+
+def _rows(table, dsn):
+    return [tuple(r.values()) for r in
+            dbutils.query_all(f"SELECT symbol, ts, price, venue FROM {table} ORDER BY symbol, ts", dsn=dsn)]
+
+
+@pytest.mark.parametrize("write", ["bulk_upsert", "copy_upsert"])
+def test_duplicate_keys_last_row_wins(quotes, pg_dsn, write):
+    rows = [
+        {"symbol": "A", "ts": 1, "price": 1.0, "venue": "X"},
+        {"symbol": "B", "ts": 1, "price": 5.0, "venue": "X"},
+        {"symbol": "A", "ts": 1, "price": 2.0, "venue": "Y"},  # same key, later row
+    ]
+    getattr(dbutils, write)(quotes, rows, conflict_cols=["symbol", "ts"], dsn=pg_dsn)
+    assert _rows(quotes, pg_dsn) == [("A", 1, 2.0, "Y"), ("B", 1, 5.0, "X")]
+
+
+def test_pages_are_sorted_and_complete(quotes, pg_dsn):
+    # unsorted input over several pages, with a repeated key spanning pages
+    rows = [{"symbol": s, "ts": t, "price": float(t), "venue": None}
+            for t in (5, 3, 9, 1) for s in ("B", "A")]
+    rows.append({"symbol": "A", "ts": 5, "price": 50.0, "venue": None})
+    n = dbutils.bulk_upsert(quotes, rows, conflict_cols=["symbol", "ts"], chunk_size=3, dsn=pg_dsn)
+    assert n == len(rows)
+    got = _rows(quotes, pg_dsn)
+    assert len(got) == 8
+    assert ("A", 5, 50.0, None) in got
+
+
+@pytest.mark.parametrize("write", ["bulk_upsert", "copy_upsert"])
+def test_null_optional_columns_keep_existing_values(quotes, pg_dsn, write):
+    fn = getattr(dbutils, write)
+    fn(quotes, [{"symbol": "A", "ts": 1, "price": 1.0, "venue": "X"}],
+       conflict_cols=["symbol", "ts"], dsn=pg_dsn)
+    fn(quotes, [{"symbol": "A", "ts": 1, "price": 2.0, "venue": None}],
+       conflict_cols=["symbol", "ts"], coalesce_cols=["venue"], dsn=pg_dsn)
+    assert _rows(quotes, pg_dsn) == [("A", 1, 2.0, "X")]
+
+
+def test_null_without_coalesce_overwrites(quotes, pg_dsn):
+    dbutils.bulk_upsert(quotes, [{"symbol": "A", "ts": 1, "price": 1.0, "venue": "X"}],
+                        conflict_cols=["symbol", "ts"], dsn=pg_dsn)
+    dbutils.bulk_upsert(quotes, [{"symbol": "A", "ts": 1, "price": None, "venue": None}],
+                        conflict_cols=["symbol", "ts"], dsn=pg_dsn)
+    assert _rows(quotes, pg_dsn) == [("A", 1, None, None)]
@@ -0,0 +1,35 @@
+from common.dbutils import _split_sql_statements as split
+
+
+def test_plain_statements():
+    assert split("SELECT 1; SELECT 2;\n\n;  ") == ["SELECT 1", "SELECT 2"]
+
+
+def test_semicolons_in_quotes():
+    sql = "INSERT INTO t VALUES ('a;b', 'it''s; ok'); SELECT \"odd;col\" FROM t"
+    assert split(sql) == ["INSERT INTO t VALUES ('a;b', 'it''s; ok')", 'SELECT "odd;col" FROM t']
+
+
+def test_semicolons_in_comments():
+    sql = "SELECT 1 -- trailing; comment\n; /* block; comment */ SELECT 2"
+    assert split(sql) == ["SELECT 1 -- trailing; comment", "/* block; comment */ SELECT 2"]
+
+
+def test_dollar_quoted_bodies():
+    fn = (
+        "CREATE FUNCTION f() RETURNS int AS $$\n"
+        "BEGIN PERFORM 1; RETURN 2; END;\n"
+        "$$ LANGUAGE plpgsql"
+    )
+    tagged = "DO $body$ BEGIN RAISE NOTICE 'x;$$;y'; END $body$"
+    assert split(f"{fn};\n{tagged};\nSELECT 3;") == [fn, tagged, "SELECT 3"]
+
+
+def test_dollar_params_are_not_quotes():
+    assert split("PREPARE p AS SELECT $1 + $2; EXECUTE p(1, 2)") == [
+        "PREPARE p AS SELECT $1 + $2", "EXECUTE p(1, 2)"
+    ]
+
+
+def test_unterminated_quote_runs_to_end():
+    assert split("SELECT 'open; still open") == ["SELECT 'open; still open"]